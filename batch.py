@@ -0,0 +1,132 @@
+"""
+Headless balance runs: many seeded bot games per character, in parallel.
+
+Each game is a Simulation driven by BotPolicy until game over or the tick
+cap. Games are independent, so they are spread over a process pool (one
+worker per core by default) and the results are sorted by (character,
+seed) afterwards: the same seeds always give the same table.
+
+    python batch.py -n 200                     # every character, 200 games each
+    python batch.py -c Rogue -c Gunner -n 1000 --minutes 15
+    python batch.py -n 50 --workers 1 --out runs.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+from characters import CHARACTER_LIST
+from simulation import Simulation, BotPolicy
+from utils import TICK_RATE
+
+
+# --------------------------------------------------------
+# ONE GAME
+# --------------------------------------------------------
+def run_game(job):
+    """job: (character, seed, max_ticks, enemy_backend) -> result dict."""
+    character, seed, max_ticks, enemy_backend = job
+    sim = Simulation(character, seed=seed, policy=BotPolicy(), enemy_backend=enemy_backend)
+    sim.run(max_ticks)
+    sim.close()
+    return {
+        "character": character,
+        "seed": seed,
+        "survival_time": sim.game_manager.time,
+        "survived": not sim.game_over,
+        "level": sim.player.level,
+        "kills": sim.kills,
+        "contact_deaths": sim.contact_deaths,
+        "xp": sim.player.xp_total,
+        "ticks": sim.ticks,
+    }
+
+
+def run_games(jobs, workers):
+    """Run every job, in a process pool when workers > 1. Sorted results."""
+    if workers <= 1:
+        results = [run_game(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = list(pool.imap_unordered(run_game, jobs, chunksize=1))
+    results.sort(key=lambda r: (r["character"], r["seed"]))
+    return results
+
+
+# --------------------------------------------------------
+# SUMMARY
+# --------------------------------------------------------
+def summarize(results):
+    """Per-character means / medians of the per-game stats."""
+    by_character = {}
+    for r in results:
+        by_character.setdefault(r["character"], []).append(r)
+
+    summary = {}
+    for character, games in by_character.items():
+        times = [g["survival_time"] for g in games]
+        summary[character] = {
+            "games": len(games),
+            "survival_mean": statistics.fmean(times),
+            "survival_p50": statistics.median(times),
+            "survived_pct": 100.0 * sum(g["survived"] for g in games) / len(games),
+            "level_mean": statistics.fmean(g["level"] for g in games),
+            "kills_mean": statistics.fmean(g["kills"] for g in games),
+            "contact_mean": statistics.fmean(g["contact_deaths"] for g in games),
+            "xp_mean": statistics.fmean(g["xp"] for g in games),
+        }
+    return summary
+
+
+def format_table(summary):
+    header = (f"{'character':<12} {'games':>6} {'surv mean':>10} {'surv p50':>9} "
+              f"{'alive %':>8} {'level':>6} {'kills':>8} {'contact':>8} {'xp':>8}")
+    lines = [header, "-" * len(header)]
+    for character, s in sorted(summary.items()):
+        lines.append(f"{character:<12} {s['games']:>6} {s['survival_mean']:>9.1f}s "
+                     f"{s['survival_p50']:>8.1f}s {s['survived_pct']:>7.1f}% "
+                     f"{s['level_mean']:>6.2f} {s['kills_mean']:>8.1f} {s['contact_mean']:>8.1f} "
+                     f"{s['xp_mean']:>8.1f}")
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------
+# CLI
+# --------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded headless bot games per character.")
+    parser.add_argument("-c", "--character", action="append", choices=sorted(CHARACTER_LIST),
+                        help="character to run (repeatable, default: all)")
+    parser.add_argument("-n", "--games", type=int, default=100, help="games per character")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--minutes", type=float, default=10.0,
+                        help="game-time cap per game (survivors count as alive)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--enemy-backend", choices=["sprites", "array"], default="array")
+    parser.add_argument("--out", help="also write per-game results + summary as JSON")
+    args = parser.parse_args(argv)
+
+    characters = args.character or list(CHARACTER_LIST)
+    max_ticks = int(args.minutes * 60 * TICK_RATE)
+    # Same seeds for every character, so the comparison is paired
+    jobs = [(character, args.seed + i, max_ticks, args.enemy_backend)
+            for character in characters for i in range(args.games)]
+
+    start = time.perf_counter()
+    results = run_games(jobs, args.workers)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print(format_table(summary))
+    print(f"\n{len(jobs)} games on {args.workers} worker(s) in {elapsed:.1f}s", file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "summary": summary, "games": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
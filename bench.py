@@ -0,0 +1,212 @@
+"""
+Scenario benchmarks for the update and draw hot paths.
+
+Runs seeded, headless scenarios (no window needed) and reports per-tick
+time split by update phase (Simulation.phases) and draw phase
+(renderer.DRAW_PHASES). Results are written as JSON so runs can be diffed.
+
+    python bench.py                       # every scenario
+    python bench.py -s enemies_1k -t 300  # one scenario, 300 ticks
+    python bench.py --out bench.json --no-draw
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+import pygame
+
+from characters import CHARACTER_LIST
+from enemy import BasicEnemy, FastEnemy, TankEnemy, spawn_enemy
+from pool import pool_stats
+from renderer import draw_game, cull_stats
+from simulation import Simulation, BotPolicy
+from utils import WIDTH, HEIGHT, WORLD_WIDTH, WORLD_HEIGHT
+from xp_orb import XPOrb
+
+
+# --------------------------------------------------------
+# SCENARIOS
+# --------------------------------------------------------
+# enemies/orbs: live population placed at tick 0
+# time: starting GameManager.time (>= 340s pins the spawn rate at 8 frames)
+# fire: projectiles fired from the player per tick, at random angles
+SCENARIOS = {
+    "enemies_100": {"enemies": 100},
+    "enemies_1k": {"enemies": 1000},
+    "enemies_5k": {"enemies": 5000},
+    "orbs_10k": {"orbs": 10000},
+    "late_game": {"enemies": 1000, "orbs": 2000, "time": 400.0},
+    "projectiles": {"enemies": 2000, "fire": 8},
+}
+for _name in CHARACTER_LIST:
+    SCENARIOS["character_" + _name.lower()] = {"character": _name, "enemies": 300}
+
+
+def build_scenario(name, seed, enemy_backend="sprites"):
+    """Create a Simulation populated for scenario `name`."""
+    spec = SCENARIOS[name]
+    sim = Simulation(spec.get("character", "Warrior"), map_type="forest",
+                     seed=seed, policy=BotPolicy(), enemy_backend=enemy_backend)
+
+    # Keep the player alive so every tick measures the full update path
+    sim.player.max_health = sim.player.health = 10 ** 9
+    sim.game_manager.time = spec.get("time", 0.0)
+
+    rng = random.Random(seed)
+    px, py = sim.player.rect.center
+    # same difficulty formula as GameManager.update
+    scale = 1.0 + sim.player.level * 0.18 + sim.game_manager.time / 200.0
+
+    # Enemies on a ring around the player so they take a while to arrive
+    for _ in range(spec.get("enemies", 0)):
+        angle = rng.uniform(0, math.tau)
+        dist = rng.uniform(300, 1200)
+        x = min(max(px + math.cos(angle) * dist, 0), WORLD_WIDTH)
+        y = min(max(py + math.sin(angle) * dist, 0), WORLD_HEIGHT)
+        enemy_class = rng.choices([BasicEnemy, FastEnemy, TankEnemy], weights=[3, 2, 2])[0]
+        spawn_enemy(sim.enemies, enemy_class, x, y, scale)
+
+    # Orbs spread over the whole world
+    for _ in range(spec.get("orbs", 0)):
+        sim.xp_orbs.add(XPOrb(rng.randint(0, WORLD_WIDTH), rng.randint(0, WORLD_HEIGHT),
+                              rng.randint(1, 5)))
+
+    return sim
+
+
+# --------------------------------------------------------
+# TIMING
+# --------------------------------------------------------
+class PhaseTimer:
+    """timer(name, phase, *args) callable that records one sample per call."""
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.samples = {}
+
+    def __call__(self, name, phase, *args):
+        start = time.perf_counter()
+        phase(*args)
+        elapsed = time.perf_counter() - start
+        self.samples.setdefault(self.prefix + name, []).append(elapsed)
+
+
+def summarize(samples):
+    """Mean / p50 / p95 / max in milliseconds."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "mean_ms": sum(ordered) / n * 1000,
+        "p50_ms": ordered[n // 2] * 1000,
+        "p95_ms": ordered[min(n - 1, int(n * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def snapshot_scenario(path, enemy_backend="sprites"):
+    """A Simulation resumed from a snapshot file (see snapshot.py), bot-driven."""
+    from snapshot import load_snapshot
+    sim = load_snapshot(path, policy=BotPolicy(), enemy_backend=enemy_backend)
+    sim.player.max_health = sim.player.health = 10 ** 9
+    return sim
+
+
+def run_scenario(name, ticks, seed, draw=True, enemy_backend="sprites", snapshot=None):
+    if snapshot is not None:
+        sim = snapshot_scenario(snapshot, enemy_backend)
+        name = snapshot
+        spec = {"snapshot": snapshot}
+    else:
+        sim = build_scenario(name, seed, enemy_backend)
+        spec = SCENARIOS[name]
+    surface = pygame.Surface((WIDTH, HEIGHT)) if draw else None
+
+    update_timer = PhaseTimer("update.")
+    draw_timer = PhaseTimer("draw.")
+    cull_stats.reset()
+    totals = []
+    enemy_counts = []
+    projectile_counts = []
+    fire = spec.get("fire", 0)
+    fire_rng = random.Random(seed)
+    projectiles = sim.weapon_manager.projectiles
+
+    for _ in range(ticks):
+        if fire:
+            px, py = sim.player.rect.center
+            projectiles.spawn_many(px, py, [fire_rng.uniform(0, math.tau) for _ in range(fire)],
+                                   sim.player.base_damage)
+        start = time.perf_counter()
+        sim.step(timer=update_timer)
+        if draw:
+            draw_game(surface, sim, (0, 0), timer=draw_timer)
+        totals.append(time.perf_counter() - start)
+        enemy_counts.append(len(sim.enemies))
+        projectile_counts.append(len(projectiles))
+    sim.close()
+
+    phases = {}
+    for timer in (update_timer, draw_timer):
+        for phase, samples in timer.samples.items():
+            phases[phase] = summarize(samples)
+
+    return {
+        "scenario": name,
+        "spec": spec,
+        "ticks": ticks,
+        "seed": seed,
+        "enemy_backend": enemy_backend,
+        "tick": summarize(totals),
+        "phases": phases,
+        "enemies_mean": sum(enemy_counts) / len(enemy_counts),
+        "enemies_final": len(sim.enemies),
+        "orbs_final": len(sim.xp_orbs),
+        "projectiles_mean": sum(projectile_counts) / len(projectile_counts),
+        "projectile_hits": projectiles.hits,
+        "cull": cull_stats.summary(),
+        "pools": pool_stats(),
+    }
+
+
+# --------------------------------------------------------
+# CLI
+# --------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded update/draw benchmarks.")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("-t", "--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--enemy-backend", choices=["sprites", "array"], default="sprites")
+    parser.add_argument("--no-draw", action="store_true", help="only time the update path")
+    parser.add_argument("--snapshot", help="start from this world snapshot instead of a scenario")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "scenarios": [],
+    }
+
+    names = [args.snapshot] if args.snapshot else args.scenario or list(SCENARIOS)
+    for name in names:
+        result = run_scenario(name, args.ticks, args.seed, draw=not args.no_draw,
+                              enemy_backend=args.enemy_backend, snapshot=args.snapshot)
+        results["scenarios"].append(result)
+        print(f"{name:<22} {result['tick']['mean_ms']:8.3f} ms/tick", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
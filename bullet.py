@@ -1,25 +1,77 @@
-import pygame
 import math
 from utils import WORLD_WIDTH, WORLD_HEIGHT  # Added world dimensions
+from pool import release
+from sprite_atlas import circle_sprite
+
+BULLET_COLOR = (255, 220, 0)
+# (left, top, right, bottom) bullets are dropped outside of on the fixed world
+WORLD_BOUNDS = (-50, -50, WORLD_WIDTH + 50, WORLD_HEIGHT + 50)
 
 class Bullet:
+    # Bounds off_screen() checks; None on endless maps, where bullets
+    # expire after MAX_TRAVEL pixels instead. Each WeaponManager points it
+    # at its own world only while its weapons update, so simulations with
+    # different bounds can run side by side.
+    world_bounds = WORLD_BOUNDS
+    MAX_TRAVEL = 2000
+
     def __init__(self, x, y, angle):
+        self.reset(x, y, angle)
+
+    def reset(self, x, y, angle):
+        """(Re)initialize; pooled bullets go through pool.acquire(Bullet, ...)."""
         self.x = x + math.cos(angle) * 45
         self.y = y + math.sin(angle) * 45
         self.angle = angle
         self.speed = 18
         self.radius = 7
+        self.traveled = 0
+        # Per-tick step, computed once (the angle never changes in flight)
+        self.dx = math.cos(angle) * self.speed
+        self.dy = math.sin(angle) * self.speed
 
     def update(self):
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+        self.x += self.dx
+        self.y += self.dy
+        self.traveled += self.speed
 
     def draw(self, surface, offset_x, offset_y):  # Added offset parameters
         # Draw with camera offset
-        draw_x = int(self.x - offset_x)
-        draw_y = int(self.y - offset_y)
-        pygame.draw.circle(surface, (255, 220, 0), (draw_x, draw_y), self.radius)
+        r = self.radius
+        surface.blit(circle_sprite(BULLET_COLOR, r),
+                     (int(self.x - offset_x) - r, int(self.y - offset_y) - r))
 
     def off_screen(self):
         # Check against world boundaries instead of screen
-        return not (-50 <= self.x <= WORLD_WIDTH + 50 and -50 <= self.y <= WORLD_HEIGHT + 50)
\ No newline at end of file
+        if Bullet.world_bounds is None:
+            return self.traveled > Bullet.MAX_TRAVEL
+        left, top, right, bottom = Bullet.world_bounds
+        return not (left <= self.x <= right and top <= self.y <= bottom)
+
+
+def draw_bullets(surface, bullets, ox, oy, view=None):
+    """
+    Draw a list of bullets with one Surface.blits call.
+    view: optional world Rect; bullets outside it are skipped.
+    Returns the number drawn.
+    """
+    items = []
+    for b in bullets:
+        if view is not None and not view.collidepoint(b.x, b.y):
+            continue
+        r = b.radius
+        items.append((circle_sprite(BULLET_COLOR, r),
+                      (int(b.x - ox) - r, int(b.y - oy) - r)))
+    surface.blits(items, doreturn=False)
+    return len(items)
+
+
+def prune_bullets(bullets):
+    """Remove off-screen bullets from the list in place and return them to the pool."""
+    kept = []
+    for b in bullets:
+        if b.off_screen():
+            release(b)
+        else:
+            kept.append(b)
+    bullets[:] = kept
\ No newline at end of file
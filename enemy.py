@@ -1,6 +1,10 @@
 import pygame
 import math
 
+from pool import acquire, release
+from sprite_atlas import circle_sprite, hp_bars, hp_bar_step
+from xp_orb import XPOrb
+
 
 class Enemy(pygame.sprite.Sprite):
     """Base class for all enemies."""
@@ -14,26 +18,43 @@ class Enemy(pygame.sprite.Sprite):
         self.color = color
         self.xp_reward = xp_reward
 
-        # Sprite
-        self.image = pygame.Surface((20, 20), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (10, 10), 10)
+        # Sprite (shared per color, see sprite_atlas)
+        self.image = circle_sprite(color, 10)
         self.rect = self.image.get_rect(center=(x, y))
+        # Center at the start of the tick, for interpolated drawing
+        self.prev_center = self.rect.center
 
-    def update(self, player):
-        """Move toward player."""
+    def reset(self, x, y, scale=1.0):
+        """Re-arm a pooled or recycled enemy of a typed subclass."""
+        hp = int(self.BASE_HP * scale)
+        self.health = hp
+        self.max_health = hp
+        self.speed = self.SPEED
+        self.xp_reward = self.XP_REWARD
+        self.rect.center = (x, y)
+        self.prev_center = self.rect.center
+
+    def update(self, player, field=None):
+        """Move toward player (around obstacles if a FlowField is given)."""
+        self.prev_center = self.rect.center
         if not player.is_alive():
             return
 
         px, py = player.rect.center
         ex, ey = self.rect.center
 
-        dx = px - ex
-        dy = py - ey
-        dist = math.hypot(dx, dy)
+        step = field.direction(ex, ey) if field is not None else None
+        if step is not None:
+            self.rect.x += step[0] * self.speed
+            self.rect.y += step[1] * self.speed
+        else:
+            dx = px - ex
+            dy = py - ey
+            dist = math.hypot(dx, dy)
 
-        if dist != 0:
-            self.rect.x += (dx / dist) * self.speed
-            self.rect.y += (dy / dist) * self.speed
+            if dist != 0:
+                self.rect.x += (dx / dist) * self.speed
+                self.rect.y += (dy / dist) * self.speed
 
         # Enemy touches player
         if self.rect.colliderect(player.rect):
@@ -41,52 +62,104 @@ class Enemy(pygame.sprite.Sprite):
             self.health = 0  # dies on contact
 
     def handle_death(self, xp_group):
-        """Add XP orbs and remove enemy."""
+        """Add XP orbs and remove enemy. Returns True if it died."""
         if self.health <= 0:
-            from xp_orb import XPOrb
-            xp_group.add(XPOrb(self.rect.centerx, self.rect.centery, self.xp_reward))
+            xp_group.add(acquire(XPOrb, self.rect.centerx, self.rect.centery, self.xp_reward))
             self.kill()
+            release(self)
+            return True
+        return False
 
     def draw(self, surface, ox, oy):
-        cx = self.rect.centerx - ox
-        cy = self.rect.centery - oy
-
-        # Enemy circle
-        pygame.draw.circle(surface, self.color, (cx, cy), 10)
-
-        # HP bar
-        bar_w = 20
-        hp_ratio = max(self.health / self.max_health, 0)   # ✔ FIXED
+        surface.blits(self.blit_items(ox, oy), doreturn=False)
 
-        pygame.draw.rect(surface, (150, 0, 0), (cx - 10, cy - 18, bar_w, 4))
-        pygame.draw.rect(surface, (0, 200, 0), (cx - 10, cy - 18, bar_w * hp_ratio, 4))
+    def blit_items(self, ox, oy):
+        """(surface, pos) pairs for the body and HP bar."""
+        cx = int(self.rect.centerx - ox)
+        cy = int(self.rect.centery - oy)
+        bar = hp_bars()[hp_bar_step(self.health / self.max_health)]
+        return ((self.image, (cx - 10, cy - 10)), (bar, (cx - 10, cy - 18)))
 
 
 # ---------------------------------------------------------
 # ENEMY TYPES
 # ---------------------------------------------------------
+# Stats live on the class so the sprite enemies and the array-backed
+# EnemyStore (enemy_store.py) share one definition.
 class BasicEnemy(Enemy):
+    BASE_HP = 25
+    SPEED = 1.6
+    COLOR = (255, 80, 80)
+    XP_REWARD = 3
+
     def __init__(self, x, y, scale=1.0):
-        hp = int(25 * scale)
-        speed = 1.6
-        color = (255, 80, 80)
-        xp_reward = 3
-        super().__init__(x, y, hp, speed, color, xp_reward)
+        super().__init__(x, y, int(self.BASE_HP * scale), self.SPEED, self.COLOR, self.XP_REWARD)
 
 
 class FastEnemy(Enemy):
+    BASE_HP = 15
+    SPEED = 3.2
+    COLOR = (255, 255, 80)
+    XP_REWARD = 2
+
     def __init__(self, x, y, scale=1.0):
-        hp = int(15 * scale)
-        speed = 3.2
-        color = (255, 255, 80)
-        xp_reward = 2
-        super().__init__(x, y, hp, speed, color, xp_reward)
+        super().__init__(x, y, int(self.BASE_HP * scale), self.SPEED, self.COLOR, self.XP_REWARD)
 
 
 class TankEnemy(Enemy):
+    BASE_HP = 60
+    SPEED = 0.9
+    COLOR = (140, 40, 40)
+    XP_REWARD = 5
+
     def __init__(self, x, y, scale=1.0):
-        hp = int(60 * scale)
-        speed = 0.9
-        color = (140, 40, 40)
-        xp_reward = 5
-        super().__init__(x, y, hp, speed, color, xp_reward)
+        super().__init__(x, y, int(self.BASE_HP * scale), self.SPEED, self.COLOR, self.XP_REWARD)
+
+
+ENEMY_TYPES = [BasicEnemy, FastEnemy, TankEnemy]
+
+
+def spawn_enemy(enemies, enemy_class, x, y, scale=1.0):
+    """Add a new enemy to a sprite Group or an EnemyStore."""
+    spawn = getattr(enemies, "spawn", None)
+    if spawn is not None:
+        spawn(enemy_class, x, y, scale)
+    else:
+        enemies.add(acquire(enemy_class, x, y, scale))
+
+
+def draw_enemies(surface, enemies, ox, oy):
+    """Draw a sprite group of enemies with one Surface.blits call."""
+    items = []
+    extend = items.extend
+    for e in enemies:
+        extend(e.blit_items(ox, oy))
+    surface.blits(items, doreturn=False)
+
+
+def recycle_enemy(enemies, px, py, min_distance, x, y, scale=1.0):
+    """
+    Move the enemy farthest from (px, py), if it is beyond `min_distance`,
+    to (x, y) with fresh HP for `scale`. Returns True if one was moved.
+    Works on a sprite Group (SpatialGroup index kept in sync) or an EnemyStore.
+    """
+    recycle = getattr(enemies, "recycle", None)
+    if recycle is not None:
+        return recycle(px, py, min_distance, x, y, scale)
+
+    far = None
+    far_d2 = min_distance * min_distance
+    for e in enemies:
+        dx = e.rect.centerx - px
+        dy = e.rect.centery - py
+        d2 = dx * dx + dy * dy
+        if d2 > far_d2:
+            far, far_d2 = e, d2
+    if far is None:
+        return False
+
+    far.reset(x, y, scale)
+    refresh = getattr(enemies, "refresh", None)
+    if refresh is not None:
+        refresh(far)
+    return True
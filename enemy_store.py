@@ -0,0 +1,364 @@
+import numpy as np
+import pygame
+
+from enemy import ENEMY_TYPES
+from sprite_atlas import HP_BAR_STEPS, circle_sprite, hp_bars
+from spatial_hash import PointGrid
+from pool import acquire
+from xp_orb import XPOrb
+
+
+ENEMY_SIZE = 20         # same 20x20 box as the Enemy sprite
+CONTACT_DAMAGE = 10
+
+
+class _ViewRect(pygame.Rect):
+    """
+    The Rect handed out by EnemyView.rect: moving it (rect.x += ...,
+    rect.center = ..., move_ip, clamp_ip) moves the enemy in the store,
+    so knockback written for sprite enemies works on both backends.
+    """
+    __slots__ = ("store", "index")
+
+    def _moved(self, old_center):
+        store = getattr(self, "store", None)    # unset on copies (move(), copy())
+        if store is not None:
+            cx, cy = self.center
+            store.x[self.index] += cx - old_center[0]
+            store.y[self.index] += cy - old_center[1]
+
+    def __setattr__(self, name, value):
+        if name in _ViewRect.__slots__:
+            object.__setattr__(self, name, value)
+            return
+        old_center = self.center
+        super().__setattr__(name, value)
+        self._moved(old_center)
+
+    def move_ip(self, *args):
+        old_center = self.center
+        super().move_ip(*args)
+        self._moved(old_center)
+
+    def clamp_ip(self, *args):
+        old_center = self.center
+        super().clamp_ip(*args)
+        self._moved(old_center)
+
+    def update(self, *args):
+        old_center = self.center
+        super().update(*args)
+        self._moved(old_center)
+
+
+class EnemyView:
+    """
+    Sprite-like handle on one enemy in an EnemyStore, so code written for
+    the sprite Group (weapons, minimap, bots) keeps working.
+    Only valid until the store's next handle_deaths() (indices compact).
+    """
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def rect(self):
+        """A Rect at the enemy's position; moving it moves the enemy."""
+        half = ENEMY_SIZE // 2
+        r = _ViewRect(int(self.store.x[self.index]) - half, int(self.store.y[self.index]) - half,
+                      ENEMY_SIZE, ENEMY_SIZE)
+        r.store = self.store
+        r.index = self.index
+        return r
+
+    @rect.setter
+    def rect(self, value):
+        self.store.x[self.index], self.store.y[self.index] = pygame.Rect(value).center
+
+    @property
+    def health(self):
+        return self.store.health[self.index]
+
+    @health.setter
+    def health(self, value):
+        self.store.health[self.index] = value
+
+    @property
+    def max_health(self):
+        return self.store.max_health[self.index]
+
+    @property
+    def speed(self):
+        return self.store.speed[self.index]
+
+    @property
+    def xp_reward(self):
+        return int(self.store.xp_reward[self.index])
+
+    @property
+    def color(self):
+        return self.store.types[self.store.type[self.index]].COLOR
+
+    def alive(self):
+        return self.health > 0 and not self.store.killed[self.index]
+
+    def kill(self):
+        """Remove without dropping XP (like Sprite.kill)."""
+        self.store.killed[self.index] = True
+
+    def handle_death(self, xp_group):
+        # Deaths are resolved in one batch by EnemyStore.handle_deaths
+        return False
+
+
+class EnemyStore:
+    """
+    NumPy struct-of-arrays enemy population.
+
+    Positions, speeds, HP, type and XP reward live in parallel arrays;
+    chase movement, contact damage and death marking each run as one
+    batched step per tick instead of one Python call per enemy. Enemy
+    types come from the BasicEnemy/FastEnemy/TankEnemy class stats.
+
+    Works as a drop-in for the enemies sprite Group in Simulation
+    (len(), iteration, add()) with spawn() as the allocation-free path.
+    reindex() rebuilds the PointGrid broadphase behind query_rect,
+    query_radius and nearest (same API as SpatialGroup).
+    """
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self.capacity = 0
+        self.types = list(ENEMY_TYPES)
+        self._type_ids = {cls: i for i, cls in enumerate(self.types)}
+
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.speed = np.zeros(0, dtype=np.float64)
+        self.health = np.zeros(0, dtype=np.float64)
+        self.max_health = np.zeros(0, dtype=np.float64)
+        self.type = np.zeros(0, dtype=np.int16)
+        self.xp_reward = np.zeros(0, dtype=np.int32)
+        self.killed = np.zeros(0, dtype=bool)
+        self.contact = np.zeros(0, dtype=bool)     # died touching the player
+        # Positions at the start of the tick, for interpolated drawing
+        self.prev_x = np.zeros(0, dtype=np.float64)
+        self.prev_y = np.zeros(0, dtype=np.float64)
+        self._grow(capacity)
+
+        self.grid = PointGrid()
+
+    # ------------------------------------------------------------
+    ARRAYS = ("x", "y", "speed", "health", "max_health", "type", "xp_reward", "killed",
+              "contact", "prev_x", "prev_y")
+
+    def _grow(self, capacity):
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def _type_id(self, enemy_class):
+        type_id = self._type_ids.get(enemy_class)
+        if type_id is None:
+            type_id = len(self.types)
+            self.types.append(enemy_class)
+            self._type_ids[enemy_class] = type_id
+        return type_id
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (EnemyView(self, i) for i in range(self.count))
+
+    # ------------------------------------------------------------
+    # SPAWNING
+    # ------------------------------------------------------------
+    def spawn(self, enemy_class, x, y, scale=1.0):
+        """Add one enemy of `enemy_class` (same stats/scale as its sprite)."""
+        hp = int(enemy_class.BASE_HP * scale)
+        return self._append(self._type_id(enemy_class), x, y, enemy_class.SPEED,
+                            hp, hp, enemy_class.XP_REWARD)
+
+    def add(self, *enemies):
+        """Copy existing Enemy sprites into the store (Group.add compatibility)."""
+        for e in enemies:
+            self._append(self._type_id(type(e)), e.rect.centerx, e.rect.centery,
+                         e.speed, e.health, e.max_health, e.xp_reward)
+
+    def _append(self, type_id, x, y, speed, health, max_health, xp_reward):
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.speed[i] = speed
+        self.health[i] = health
+        self.max_health[i] = max_health
+        self.type[i] = type_id
+        self.xp_reward[i] = xp_reward
+        self.killed[i] = False
+        self.contact[i] = False
+        self.count += 1
+        return i
+
+    def empty(self):
+        self.count = 0
+        self.reindex()
+
+    def recycle(self, px, py, min_distance, x, y, scale=1.0):
+        """See enemy.recycle_enemy: relocate the farthest enemy past min_distance."""
+        n = self.count
+        if n == 0:
+            return False
+        d2 = (self.x[:n] - px) ** 2 + (self.y[:n] - py) ** 2
+        d2[(self.health[:n] <= 0) | self.killed[:n]] = -1.0
+        i = int(np.argmax(d2))
+        if d2[i] <= min_distance * min_distance:
+            return False
+
+        hp = int(self.types[self.type[i]].BASE_HP * scale)
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.health[i] = hp
+        self.max_health[i] = hp
+        return True
+
+    # ------------------------------------------------------------
+    # BROADPHASE
+    # ------------------------------------------------------------
+    def reindex(self):
+        """Rebuild the grid; call after positions change / deaths compact."""
+        n = self.count
+        self.grid.rebuild(self.x[:n], self.y[:n])
+
+    def _views(self, indices):
+        # enemies spawned after the last reindex() are not in the grid yet
+        return [EnemyView(self, int(i)) for i in indices
+                if i < self.count and self.health[i] > 0 and not self.killed[i]]
+
+    def query_rect(self, rect):
+        return self._views(self.grid.query_rect(rect))
+
+    def query_radius(self, x, y, radius):
+        return self._views(self.grid.query_radius(x, y, radius))
+
+    def nearest(self, x, y, k=1, max_radius=None):
+        return self._views(self.grid.nearest(x, y, k, max_radius))
+
+    def visible(self, rect):
+        """Indices (not views) of enemies inside `rect`, for draw()."""
+        idx = self.grid.query_rect(rect)
+        return idx[idx < self.count]
+
+    # ------------------------------------------------------------
+    # BATCHED UPDATE
+    # ------------------------------------------------------------
+    def mark_previous(self):
+        """Remember the current positions as the tick's start (see prev_x)."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def update(self, player, field=None):
+        """
+        Move every enemy toward the player and apply contact damage.
+        field: optional FlowField; enemies it routes follow it instead.
+        """
+        n = self.count
+        if n == 0 or not player.is_alive():
+            return
+
+        x = self.x[:n]
+        y = self.y[:n]
+        px, py = player.rect.center
+
+        # Chase: normalized direction * speed
+        dx = px - x
+        dy = py - y
+        dist = np.hypot(dx, dy)
+        step = np.divide(self.speed[:n], dist, out=np.zeros(n), where=dist != 0)
+        step_x = dx * step
+        step_y = dy * step
+
+        if field is not None:
+            ux, uy, use = field.directions(x, y)
+            speed = self.speed[:n]
+            step_x = np.where(use, ux * speed, step_x)
+            step_y = np.where(use, uy * speed, step_y)
+
+        x += step_x
+        y += step_y
+
+        # Contact: same test as Enemy's rect.colliderect(player.rect)
+        half = ENEMY_SIZE / 2
+        pr = player.rect
+        hits = ((x - half < pr.right) & (pr.left < x + half)
+                & (y - half < pr.bottom) & (pr.top < y + half)
+                & (self.health[:n] > 0))
+        count = int(np.count_nonzero(hits))
+        if count:
+            player.health -= CONTACT_DAMAGE * count
+            self.health[:n][hits] = 0     # dies on contact
+            self.contact[:n][hits] = True
+
+    def handle_deaths(self, xp_group):
+        """
+        Drop XP orbs for dead enemies and compact the arrays.
+        Returns (kills, contact deaths): enemies taken to 0 HP by the
+        player's damage and enemies that died touching the player.
+        Removals through EnemyView.kill() count as neither.
+        """
+        n = self.count
+        if n == 0:
+            return 0, 0
+
+        killed = self.killed[:n]
+        dead = (self.health[:n] <= 0) | killed
+        if not dead.any():
+            return 0, 0
+        contact = int(np.count_nonzero(self.contact[:n] & ~killed))
+        kills = int(np.count_nonzero(dead & ~killed)) - contact
+
+        for i in np.flatnonzero(dead & ~killed):
+            xp_group.add(acquire(XPOrb, int(self.x[i]), int(self.y[i]), int(self.xp_reward[i])))
+
+        keep = ~dead
+        alive = int(np.count_nonzero(keep))
+        for name in self.ARRAYS:
+            arr = getattr(self, name)
+            arr[:alive] = arr[:n][keep]
+        self.count = alive
+        return kills, contact
+
+    # ------------------------------------------------------------
+    # DRAW
+    # ------------------------------------------------------------
+    def draw(self, surface, ox, oy, indices=None):
+        """
+        Blit enemies and their HP bars in one Surface.blits call.
+        indices: subset to draw (e.g. from visible()); default all.
+        """
+        sel = slice(0, self.count) if indices is None else indices
+        x = self.x[sel]
+        if len(x) == 0:
+            return
+        sprites = [circle_sprite(cls.COLOR, 10) for cls in self.types]
+        bars = hp_bars()
+
+        cx = (x - ox).astype(np.int64)
+        cy = (self.y[sel] - oy).astype(np.int64)
+        steps = np.clip((self.health[sel] / self.max_health[sel] * HP_BAR_STEPS).astype(np.int64),
+                        0, HP_BAR_STEPS)
+
+        items = []
+        append = items.append
+        for x, y, t, s in zip((cx - 10).tolist(), cy.tolist(),
+                              self.type[sel].tolist(), steps.tolist()):
+            append((sprites[t], (x, y - 10)))
+            append((bars[s], (x, y - 18)))
+        surface.blits(items, doreturn=False)
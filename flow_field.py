@@ -0,0 +1,227 @@
+import math
+
+import numpy as np
+
+from utils import WORLD_WIDTH, WORLD_HEIGHT
+
+
+FIELD_CELL = 32         # world pixels per flow field cell
+CLEARANCE = 26          # enemy radius + half a cell: cells whose center is this
+                        # close to a decoration's edge are blocked
+DIRECT_CELLS = 2        # this close (in BFS steps) enemies just chase the player
+ENDLESS_COLS = 96       # window size around the player on endless maps
+ENDLESS_ROWS = 64
+RECENTER_MARGIN = 16    # cells from the window edge before it is moved
+
+# 8-neighbour offsets (dx, dy) and their unit vectors
+_NEIGHBOURS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+_UNIT = [(dx / math.hypot(dx, dy), dy / math.hypot(dx, dy)) for dx, dy in _NEIGHBOURS]
+
+
+class FlowField:
+    """
+    Grid flow field toward the player, shared by every enemy.
+
+    One BFS distance field is grown from the player's cell (decorations are
+    obstacles) and each cell stores the unit vector to its lowest-distance
+    neighbour. It is rebuilt only when the player changes cell, so pathing
+    costs O(cells) per rebuild instead of work per enemy.
+
+    Cells with a clear step straight at the player (the cell one step
+    that way is closer) just chase directly, so open ground still gives
+    straight lines; the field takes over around trees and rocks. Cells
+    outside the grid, blocked or unreachable fall back to direct chase too.
+    """
+    def __init__(self, game_map, cell_size=FIELD_CELL):
+        self.game_map = game_map
+        self.cell_size = cell_size
+        self.bounded = not game_map.endless
+        if self.bounded:
+            self.cols = -(-WORLD_WIDTH // cell_size)
+            self.rows = -(-WORLD_HEIGHT // cell_size)
+        else:
+            self.cols, self.rows = ENDLESS_COLS, ENDLESS_ROWS
+        self.col0 = self.row0 = 0       # world cell of grid (0, 0)
+
+        self.blocked = None
+        self.dist = np.full((self.rows, self.cols), -1, dtype=np.int32)
+        self.dir_x = np.zeros((self.rows, self.cols))
+        self.dir_y = np.zeros((self.rows, self.cols))
+        self.use = np.zeros((self.rows, self.cols), dtype=bool)
+        self._use_rows = self.use.tolist()
+        self._dir_x_rows = self.dir_x.tolist()
+        self._dir_y_rows = self.dir_y.tolist()
+
+        self.player_cell = None
+        self.origin = None              # player position of the last rebuild
+        self.rebuilds = 0
+
+    # ------------------------------------------------------------
+    # OBSTACLES
+    # ------------------------------------------------------------
+    def _rasterize(self):
+        """Blocked-cell mask for the current window."""
+        cs = self.cell_size
+        blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        left, top = self.col0 * cs, self.row0 * cs
+        area = (left, top, self.cols * cs, self.rows * cs)
+
+        for deco in self.game_map.decorations_in_rect(area):
+            r = deco.radius + CLEARANCE
+            c_lo = max(int((deco.x - r - left) // cs), 0)
+            c_hi = min(int((deco.x + r - left) // cs), self.cols - 1)
+            r_lo = max(int((deco.y - r - top) // cs), 0)
+            r_hi = min(int((deco.y + r - top) // cs), self.rows - 1)
+            if c_lo > c_hi or r_lo > r_hi:
+                continue
+            # cell centers inside the (grown) decoration circle
+            cx = left + (np.arange(c_lo, c_hi + 1) + 0.5) * cs - deco.x
+            cy = top + (np.arange(r_lo, r_hi + 1) + 0.5) * cs - deco.y
+            blocked[r_lo:r_hi + 1, c_lo:c_hi + 1] |= (cy[:, None] ** 2 + cx[None, :] ** 2) <= r * r
+        return blocked
+
+    def _recenter(self, col, row):
+        """Endless maps: move the window when the player nears its edge."""
+        if self.blocked is not None and (
+                RECENTER_MARGIN <= col - self.col0 < self.cols - RECENTER_MARGIN
+                and RECENTER_MARGIN <= row - self.row0 < self.rows - RECENTER_MARGIN):
+            return
+        self.col0 = col - self.cols // 2
+        self.row0 = row - self.rows // 2
+        self.blocked = self._rasterize()
+
+    # ------------------------------------------------------------
+    # REBUILD
+    # ------------------------------------------------------------
+    def update(self, px, py):
+        """Rebuild if the player moved to another cell. Returns True if rebuilt."""
+        cs = self.cell_size
+        col, row = int(px // cs), int(py // cs)
+        if (col, row) == self.player_cell:
+            return False
+        self.player_cell = (col, row)
+        self.origin = (px, py)
+
+        if self.bounded:
+            if self.blocked is None:
+                self.blocked = self._rasterize()
+        else:
+            self._recenter(col, row)
+
+        gc = min(max(col - self.col0, 0), self.cols - 1)
+        gr = min(max(row - self.row0, 0), self.rows - 1)
+        self._bfs(gc, gr)
+        self._directions()
+        self._steering(px, py)
+
+        # Plain lists for the per-sprite direction() lookups
+        self._use_rows = self.use.tolist()
+        self._dir_x_rows = self.dir_x.tolist()
+        self._dir_y_rows = self.dir_y.tolist()
+        self.rebuilds += 1
+        return True
+
+    def _bfs(self, gc, gr):
+        """4-neighbour BFS from (gc, gr) as a vectorized wavefront."""
+        free = ~self.blocked
+        free[gr, gc] = True         # the player may stand in a bush
+        dist = self.dist
+        dist.fill(-1)
+        dist[gr, gc] = 0
+
+        front = np.zeros_like(free)
+        front[gr, gc] = True
+        seen = front.copy()
+        d = 0
+        while front.any():
+            d += 1
+            grown = np.zeros_like(front)
+            grown[1:] |= front[:-1]
+            grown[:-1] |= front[1:]
+            grown[:, 1:] |= front[:, :-1]
+            grown[:, :-1] |= front[:, 1:]
+            grown &= free
+            grown &= ~seen
+            dist[grown] = d
+            seen |= grown
+            front = grown
+
+    def _directions(self):
+        """
+        Per cell: unit vector to the 8-neighbour with the lowest distance.
+        A diagonal step needs both orthogonal cells it passes free, so
+        enemies never squeeze between two blocked cells.
+        """
+        rows, cols = self.rows, self.cols
+        big = np.iinfo(np.int32).max
+        padded = np.full((rows + 2, cols + 2), big, dtype=np.int64)
+        padded[1:-1, 1:-1] = np.where(self.dist >= 0, self.dist, big)
+        free = padded < big
+
+        def shifted(grid, dx, dy):
+            return grid[1 + dy:rows + 1 + dy, 1 + dx:cols + 1 + dx]
+
+        best = padded[1:-1, 1:-1].copy()
+        dir_x = np.zeros((rows, cols))
+        dir_y = np.zeros((rows, cols))
+        for (dx, dy), (ux, uy) in zip(_NEIGHBOURS, _UNIT):
+            neighbour = shifted(padded, dx, dy)
+            better = neighbour < best
+            if dx and dy:
+                better &= shifted(free, dx, 0) & shifted(free, 0, dy)
+            best = np.where(better, neighbour, best)
+            dir_x[better] = ux
+            dir_y[better] = uy
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+
+    def _steering(self, px, py):
+        """
+        Per cell: follow the field (use=True) or chase directly. Direct when
+        next to the player, unreachable, or when one cell-length straight
+        from the cell center toward the player lands in a closer cell.
+        """
+        cs = self.cell_size
+        rows, cols = self.rows, self.cols
+        cx = (self.col0 + np.arange(cols) + 0.5) * cs
+        cy = (self.row0 + np.arange(rows) + 0.5) * cs
+        dx = px - cx[None, :]
+        dy = py - cy[:, None]
+        dist = np.hypot(dx, dy)
+        dist[dist == 0] = 1.0
+
+        c2 = ((cx[None, :] + dx / dist * cs) // cs).astype(np.int64) - self.col0
+        r2 = ((cy[:, None] + dy / dist * cs) // cs).astype(np.int64) - self.row0
+        inside = (c2 >= 0) & (c2 < cols) & (r2 >= 0) & (r2 < rows)
+        d2 = self.dist[np.clip(r2, 0, rows - 1), np.clip(c2, 0, cols - 1)]
+        d = self.dist
+        clear = inside & (d2 >= 0) & (d2 < d)
+        self.use = (d > DIRECT_CELLS) & ~clear
+
+    # ------------------------------------------------------------
+    # SAMPLING
+    # ------------------------------------------------------------
+    def direction(self, x, y):
+        """
+        Unit step for an enemy at (x, y), or None to chase the player
+        directly (open line, next to the player, or off the grid).
+        """
+        cs = self.cell_size
+        c = int(x // cs) - self.col0
+        r = int(y // cs) - self.row0
+        if 0 <= c < self.cols and 0 <= r < self.rows and self._use_rows[r][c]:
+            return self._dir_x_rows[r][c], self._dir_y_rows[r][c]
+        return None
+
+    def directions(self, x, y):
+        """
+        Vectorized direction(): returns (ux, uy, use) arrays; where `use`
+        is False the enemy should chase directly.
+        """
+        cs = self.cell_size
+        c = (x // cs).astype(np.int64) - self.col0
+        r = (y // cs).astype(np.int64) - self.row0
+        inside = (c >= 0) & (c < self.cols) & (r >= 0) & (r < self.rows)
+        cc = np.clip(c, 0, self.cols - 1)
+        rr = np.clip(r, 0, self.rows - 1)
+        return self.dir_x[rr, cc], self.dir_y[rr, cc], inside & self.use[rr, cc]
@@ -1,15 +1,66 @@
 import pygame
 import random
-from utils import WIDTH, HEIGHT, screen, get_spawn_position
-from enemy import BasicEnemy, FastEnemy, TankEnemy
+from utils import WIDTH, HEIGHT, TICK_RATE, get_spawn_position
+from enemy import BasicEnemy, FastEnemy, TankEnemy, spawn_enemy, recycle_enemy
+from text_cache import render_text
+from ui_layers import Layer, overlay_layer
+
+
+# Level-up choices, in button order (choice 1..3)
+UPGRADE_OPTIONS = ["SPEED ++", "DAMAGE ++", "RANGE ++"]
+
+ENEMY_BUDGET = 500          # live enemies before spawns turn into relocations
+RECYCLE_DISTANCE = 1200     # only enemies this far from the player are relocated
+
+
+# ------------------------------------------------------------
+# SPAWN DIRECTOR
+# ------------------------------------------------------------
+class SpawnDirector:
+    """
+    Decides what a spawn tick does. Below `budget` live enemies it spawns
+    a new one; at or above it, the enemy farthest from the player (if
+    beyond `recycle_distance`, i.e. well off-screen) is moved to the fresh
+    spawn position with HP for the current difficulty instead. Pressure
+    on the player keeps its rate while the population stays bounded.
+    """
+    def __init__(self, budget=ENEMY_BUDGET, recycle_distance=RECYCLE_DISTANCE, rng=None):
+        self.budget = budget
+        self.recycle_distance = recycle_distance
+        self.rng = rng or random.Random()
+        self.spawned = 0
+        self.recycled = 0
+
+    def spawn(self, enemies, enemy_class, player, camera, scale):
+        """Returns True if an enemy was spawned or relocated."""
+        sx, sy = get_spawn_position(camera, self.rng)
+
+        if len(enemies) < self.budget:
+            spawn_enemy(enemies, enemy_class, sx, sy, scale)
+            self.spawned += 1
+            return True
+
+        px, py = player.rect.center
+        if recycle_enemy(enemies, px, py, self.recycle_distance, sx, sy, scale):
+            self.recycled += 1
+            return True
+        return False
 
 
 class GameManager:
-    def __init__(self, weapon_manager):
+    def __init__(self, weapon_manager, spawn_rng=None, type_rng=None,
+                 enemy_budget=ENEMY_BUDGET):
         self.weapon_manager = weapon_manager
 
-        self.font = pygame.font.Font(None, 60)
-        self.small_font = pygame.font.Font(None, 40)
+        # Random streams for spawn positions and enemy type picks
+        self.spawn_rng = spawn_rng or random.Random()
+        self.type_rng = type_rng or random.Random()
+
+        self.director = SpawnDirector(enemy_budget, rng=self.spawn_rng)
+
+        # Text sizes (rendered through the shared text cache)
+        self.font_size = 60
+        self.small_font_size = 40
 
         self.time = 0.0
         self.spawn_timer = 0
@@ -24,6 +75,15 @@ class GameManager:
             pygame.Rect(WIDTH // 2 - 180, HEIGHT // 2 + 60, 360, 60),
         ]
 
+        # Cached UI layers, re-rendered only when their key changes
+        self.hud_layer = Layer((10, 10, 400, 80), self._render_hud)
+        self.upgrade_dim = overlay_layer((WIDTH, HEIGHT), (0, 0, 0), 180)
+        self.upgrade_layer = Layer((WIDTH // 2 - 180, HEIGHT // 2 - 200, 360, 320),
+                                   self._render_upgrade_menu)
+        self.game_over_dim = overlay_layer((WIDTH, HEIGHT), (100, 0, 0), 220)
+        self.game_over_layer = Layer((WIDTH // 2 - 200, HEIGHT // 2 - 150, 400, 190),
+                                     self._render_game_over)
+
     # ------------------------------------------------------------
     def check_mouse_click(self, pos):
         for i, rect in enumerate(self.button_rects, start=1):
@@ -31,84 +91,107 @@ class GameManager:
                 return i
         return 0
 
+    def apply_upgrade(self, player, choice):
+        """Apply level-up choice 1..3. Returns True if an upgrade was taken."""
+        if choice == 1:
+            player.speed += 0.5
+        elif choice == 2:
+            player.base_damage += 5
+        elif choice == 3:
+            player.base_range += 20
+        else:
+            return False
+
+        player.finish_level_up()
+        self.show_upgrade = False
+        return True
+
     # ------------------------------------------------------------
     def update(self, player, enemies, xp_orbs, camera):
         if player.health <= 0:
             self.game_over = True
             return
 
-        self.time += 1 / 60
+        self.time += 1 / TICK_RATE
         self.spawn_timer += 1
 
-        # difficulty
-        scale = 1.0 + player.level * 0.18 + self.time / 200.0
+        scale = self.difficulty_scale(player)
+        enemy_class = self.pick_enemy_class()
+
+        # spawn rate
+        rate = max(25 - int(self.time // 20), 8)
+        if self.spawn_timer >= rate:
+            self.director.spawn(enemies, enemy_class, player, camera, scale)
+            self.spawn_timer = 0
 
-        # pick type
+    def difficulty_scale(self, player):
+        """Enemy HP multiplier for the current level and time."""
+        return 1.0 + player.level * 0.18 + self.time / 200.0
+
+    def pick_enemy_class(self):
+        """Enemy type mix for the current time."""
         if self.time < 60:
-            enemy_class = BasicEnemy
+            return BasicEnemy
         elif self.time < 180:
-            enemy_class = random.choices(
+            return self.type_rng.choices(
                 [BasicEnemy, FastEnemy],
                 weights=[3, 1],
                 k=1
             )[0]
         else:
-            enemy_class = random.choices(
+            return self.type_rng.choices(
                 [BasicEnemy, FastEnemy, TankEnemy],
                 weights=[3, 2, 2],
                 k=1
             )[0]
 
-        # spawn rate
-        rate = max(25 - int(self.time // 20), 8)
-        if self.spawn_timer >= rate:
-            sx, sy = get_spawn_position(camera)
-            enemies.add(enemy_class(sx, sy, scale))
-            self.spawn_timer = 0
-
     # ------------------------------------------------------------
-    def draw(self, player, mouse_pos):
-        # Time
-        screen.blit(self.small_font.render(f"Time: {int(self.time)}s", True, (255, 255, 255)), (10, 10))
-
-        # Level
-        screen.blit(self.small_font.render(f"LVL {player.level}", True, (255, 255, 120)), (10, 50))
+    def draw(self, surface, player, mouse_pos):
+        # Time + level (dirty on whole seconds / level change)
+        self.hud_layer.draw(surface, (int(self.time), player.level))
 
         # Hint
         if player.has_level_up_ready() and not self.show_upgrade and not self.game_over:
-            hint = self.small_font.render("Press ESC to choose upgrade", True, (255, 255, 180))
-            screen.blit(hint, (WIDTH // 2 - 200, HEIGHT - 80))
+            hint = render_text("Press ESC to choose upgrade", self.small_font_size, (255, 255, 180))
+            surface.blit(hint, (WIDTH // 2 - 200, HEIGHT - 80))
 
-        # Level-up menu
+        # Level-up menu (dirty on hover state)
         if self.show_upgrade:
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-
-            title = self.font.render("LEVEL UP!", True, (255, 255, 120))
-            screen.blit(title, (WIDTH // 2 - 160, HEIGHT // 2 - 200))
-
-            options = ["SPEED ++", "DAMAGE ++", "RANGE ++"]
-
-            for text, rect in zip(options, self.button_rects):
-                hovered = rect.collidepoint(mouse_pos)
-                pygame.draw.rect(screen, (60, 60, 90), rect)
-                pygame.draw.rect(screen,
-                                 (255, 255, 120) if hovered else (120, 120, 120),
-                                 rect, 3)
-                t = self.font.render(text, True, (255, 255, 255))
-                screen.blit(t, t.get_rect(center=rect.center))
-
-        # Game over
-        if self.game_over:
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(220)
-            overlay.fill((100, 0, 0))
-            screen.blit(overlay, (0, 0))
+            self.upgrade_dim.draw(surface)
+            hovered = tuple(rect.collidepoint(mouse_pos) for rect in self.button_rects)
+            self.upgrade_layer.draw(surface, hovered)
 
-            title = self.font.render("GAME OVER", True, (255, 80, 80))
-            screen.blit(title, (WIDTH // 2 - 200, HEIGHT // 2 - 150))
+        # Game over (static)
+        if self.game_over:
+            self.game_over_dim.draw(surface)
+            self.game_over_layer.draw(surface)
 
-            restart = self.small_font.render("Press R to Restart", True, (255, 255, 0))
-            screen.blit(restart, (WIDTH // 2 - 150, HEIGHT // 2))
+    # ------------------------------------------------------------
+    # LAYER RENDERERS (local coordinates)
+    # ------------------------------------------------------------
+    def _render_hud(self, surface, key):
+        seconds, level = key
+        surface.blit(render_text(f"Time: {seconds}s", self.small_font_size, (255, 255, 255)), (0, 0))
+        surface.blit(render_text(f"LVL {level}", self.small_font_size, (255, 255, 120)), (0, 40))
+
+    def _render_upgrade_menu(self, surface, hovered):
+        ox, oy = self.upgrade_layer.rect.topleft
+
+        title = render_text("LEVEL UP!", self.font_size, (255, 255, 120))
+        surface.blit(title, (WIDTH // 2 - 160 - ox, HEIGHT // 2 - 200 - oy))
+
+        for text, rect, hover in zip(UPGRADE_OPTIONS, self.button_rects, hovered):
+            rect = rect.move(-ox, -oy)
+            pygame.draw.rect(surface, (60, 60, 90), rect)
+            pygame.draw.rect(surface,
+                             (255, 255, 120) if hover else (120, 120, 120),
+                             rect, 3)
+            t = render_text(text, self.font_size, (255, 255, 255))
+            surface.blit(t, t.get_rect(center=rect.center))
+
+    def _render_game_over(self, surface, key):
+        title = render_text("GAME OVER", self.font_size, (255, 80, 80))
+        surface.blit(title, (0, 0))
+
+        restart = render_text("Press R to Restart", self.small_font_size, (255, 255, 0))
+        surface.blit(restart, (50, 150))
@@ -1,57 +1,38 @@
-import pygame
-import random
+import time
+STARTED = time.perf_counter()       # startup report baseline (see startup.py)
 
-from characters import CHARACTER_LIST
-from player import Player
-from enemy import BasicEnemy, FastEnemy, TankEnemy
-from map import Map
-from utils import WIDTH, HEIGHT, screen, WORLD_WIDTH, WORLD_HEIGHT, Camera
-from weapon_manager import WeaponManager
-from xp_orb import XPOrb
-from game_manager import GameManager
-
-pygame.init()
-pygame.display.set_caption("Pixel Survivors - Character Select + Camera World")
-clock = pygame.time.Clock()
+import os
 
+import pygame
 
-# --------------------------------------------------------
-# MINIMAP DRAW FUNCTION
-# --------------------------------------------------------
-def draw_minimap(player, enemies, surface):
-    MAP_W, MAP_H = 180, 180
-    margin = 20
+from characters import CHARACTER_LIST
+from utils import WIDTH, init_display
+from startup import StartupTimer, GameLoader, init_audio_async
+from text_cache import render_text
 
-    rect = pygame.Rect(surface.get_width() - MAP_W - margin,
-                       margin,
-                       MAP_W, MAP_H)
+# The game modules (simulation, renderer, ...) are imported by GameLoader
+# on a background thread while the character select screen is up.
 
-    # background box
-    pygame.draw.rect(surface, (10, 10, 10), rect)
-    pygame.draw.rect(surface, (255, 255, 255), rect, 2)
+clock = pygame.time.Clock()
 
-    # scale factors
-    sx = MAP_W / WORLD_WIDTH
-    sy = MAP_H / WORLD_HEIGHT
+# Frame cap for drawing; the simulation itself always runs at TICK_RATE
+RENDER_FPS = 144
 
-    # --- Player dot ---
-    player.draw_minimap(surface, rect)
+# Set VAMP_RECORD=path.vrec to record every game's input (see replay.py);
+# later games in the same session get -2, -3, ... before the extension.
+RECORD_PATH = os.environ.get("VAMP_RECORD")
 
-    # --- Enemy dots ---
-    for e in enemies:
-        ex = int(e.rect.centerx * sx)
-        ey = int(e.rect.centery * sy)
-        pygame.draw.circle(surface, (255, 0, 0),
-                           (rect.x + ex, rect.y + ey), 2)
+# Frame profiler: VAMP_PROFILE=1 turns it on at start (and dumps on quit),
+# F3 toggles it with its graph, F9 dumps the ring buffer to PROFILE_PATH.
+PROFILE_PATH = os.environ.get("VAMP_PROFILE_OUT", "frames.csv")
 
 
 # --------------------------------------------------------
 # CHARACTER SELECT MENU
 # --------------------------------------------------------
-def choose_character():
+def choose_character(screen, startup=None):
     selecting = True
-    font = pygame.font.Font(None, 60)
-    small_font = pygame.font.Font(None, 40)
+    first_frame = True
 
     buttons = []
     y = 180
@@ -63,7 +44,7 @@ def choose_character():
 
     while selecting:
         screen.fill((25, 25, 40))
-        title = font.render("Choose Your Character", True, (255, 255, 120))
+        title = render_text("Choose Your Character", 60, (255, 255, 120))
         screen.blit(title, (WIDTH // 2 - 260, 60))
 
         mouse_pos = pygame.mouse.get_pos()
@@ -82,140 +63,164 @@ def choose_character():
             pygame.draw.rect(screen, (60, 60, 90), rect)
             pygame.draw.rect(screen, (255, 255, 120) if hovered else (120, 120, 120), rect, 4)
 
-            txt = small_font.render(name, True, (255, 255, 255))
+            txt = render_text(name, 40, (255, 255, 255))
             screen.blit(txt, txt.get_rect(center=rect.center))
 
             desc = CHARACTER_LIST[name].get("description", "")
             if desc:
-                desc_txt = small_font.render(desc, True, (200, 200, 200))
+                desc_txt = render_text(desc, 40, (200, 200, 200))
                 screen.blit(desc_txt, (rect.x + 10, rect.y + 45))
 
             if hovered and mouse_click:
+                if startup is not None:
+                    startup.mark("character select", idle=True)
                 return name
 
         pygame.display.flip()
+        if startup is not None and first_frame:
+            startup.mark("first frame")
+            first_frame = False
         clock.tick(60)
 
 
 # --------------------------------------------------------
 # CREATE NEW GAME
 # --------------------------------------------------------
-def create_game():
-    chosen_name = choose_character()
-    char_data = CHARACTER_LIST[chosen_name]
-
-    # Create player with character stats
-    player = Player(
-        WORLD_WIDTH // 2,
-        WORLD_HEIGHT // 2,
-        hp=char_data["hp"],
-        speed=char_data["speed"],
-        color=char_data["color"],
-    )
-    player.base_damage = char_data["damage"]
-    player.base_range = char_data["range"]
-
-    # Weapon manager + starting weapon
-    weapon_manager = WeaponManager(player)
-    weapon_manager.give_weapon(char_data["weapon"])
-
-    # Game manager
-    game_manager = GameManager(weapon_manager)
-
-    # Other game systems
-    enemies = pygame.sprite.Group()
-    xp_orbs = pygame.sprite.Group()
-    camera = Camera()
-
-    # Random map
-    map_type = random.choice(["forest", "desert", "graveyard"])
-    seed = random.randint(0, 999999)
-    game_map = Map(map_type=map_type, seed=seed)
-    print(f"Loaded map: {map_type} (seed {seed})")
-
-    return player, weapon_manager, game_manager, enemies, xp_orbs, camera, game_map
+def create_game(screen, startup=None):
+    # The map is generated in the background while the player picks
+    loader = GameLoader()
+    chosen_name = choose_character(screen, startup)
+
+    from simulation import Simulation
+    from replay import InputRecorder
+    game_map = loader.result()
+    if startup is not None:
+        startup.mark("map wait")
+    sim = Simulation(chosen_name, seed=loader.seed, game_map=game_map)
+    if startup is not None:
+        startup.mark("simulation")
+    print(f"Loaded map: {sim.map_type} (seed {sim.map_seed}, run seed {sim.seed}, "
+          f"{loader.seconds * 1000:.0f} ms in the background)")
+    if RECORD_PATH:
+        InputRecorder(sim)
+    return sim
+
+
+def save_recording(sim, game_number):
+    if sim.recorder is None:
+        return
+    path = RECORD_PATH
+    if game_number > 1:
+        root, ext = os.path.splitext(path)
+        path = f"{root}-{game_number}{ext}"
+    sim.recorder.save(path)
+    print(f"Saved input recording: {path} ({sim.recorder.ticks} ticks)")
 
 
 # --------------------------------------------------------
 # MAIN LOOP
 # --------------------------------------------------------
-player, weapon_manager, game_manager, enemies, xp_orbs, camera, game_map = create_game()
-running = True
-
-while running:
-    mouse_pos = pygame.mouse.get_pos()
-    mouse_clicked = False
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_clicked = True
-
-        if event.type == pygame.KEYDOWN:
-            # ESC only opens menu when XP upgrade is ready
-            if event.key == pygame.K_ESCAPE:
-                if player.has_level_up_ready() and not game_manager.show_upgrade and not game_manager.game_over:
-                    game_manager.show_upgrade = True
-
-            # Restart after game over
-            if game_manager.game_over and event.key == pygame.K_r:
-                player, weapon_manager, game_manager, enemies, xp_orbs, camera, game_map = create_game()
-
-    # ------------------ UPGRADE MENU ------------------
-    if game_manager.show_upgrade and mouse_clicked:
-        choice = game_manager.check_mouse_click(mouse_pos)
-        if choice == 1:
-            player.speed += 0.5
-        elif choice == 2:
-            player.base_damage += 5
-        elif choice == 3:
-            player.base_range += 20
-
-        if choice in (1, 2, 3):
-            player.finish_level_up()
-            game_manager.show_upgrade = False
-
-    # ------------------ GAME UPDATE ------------------
-    if not game_manager.show_upgrade and not game_manager.game_over:
-        player.update()
-        weapon_manager.update(enemies, xp_orbs)
-
-        for enemy in list(enemies):
-            enemy.update(player)
-            enemy.handle_death(xp_orbs)
-
-        for orb in xp_orbs:
-            orb.update(player)
-
-        camera.update(player.rect.centerx, player.rect.centery)
-        game_manager.update(player, enemies, xp_orbs, camera)
-
-    # ------------------ DRAW ------------------
-    ox, oy = camera.x, camera.y
-
-    # Map
-    game_map.draw_background(screen, ox, oy)
-    game_map.draw_decorations(screen, ox, oy)
-
-    # Entities
-    for enemy in enemies:
-        enemy.draw(screen, ox, oy)
-
-    for orb in xp_orbs:
-        orb.draw(screen, ox, oy)
-
-    player.draw(screen, ox, oy)
-    weapon_manager.draw(screen, ox, oy)
-
-    # Minimap (added back!)
-    draw_minimap(player, enemies, screen)
+def main():
+    startup = StartupTimer(STARTED)
+    startup.mark("imports")
+
+    # Only what the menu needs up front; fonts load on first use
+    pygame.display.init()
+    screen = init_display()
+    pygame.display.set_caption("Pixel Survivors - Character Select + Camera World")
+    init_audio_async()
+    startup.mark("display")
+
+    sim = create_game(screen, startup)
+    game_number = 1
+
+    from simulation import TickInput, FixedTimestep
+    from profiler import FrameProfiler
+    from renderer import draw_game, DRAW_PHASES
+    stepper = FixedTimestep()
+    profiler = FrameProfiler.from_env(
+        ["events"] + ["update." + name for name, _ in sim.phases]
+        + ["draw." + name for name, _ in DRAW_PHASES] + ["flip"])
+    clock.tick()
+    running = True
+
+    # One-shot inputs are held until a tick consumes them
+    escape = False
+    upgrade = 0
+
+    while running:
+        frame_seconds = clock.tick(RENDER_FPS) / 1000.0
+        mouse_pos = pygame.mouse.get_pos()
+        mouse_clicked = False
 
-    # UI
-    game_manager.draw(player, mouse_pos)
+        # Profiling is decided per frame; off means no timers at all
+        prof = profiler if profiler.enabled else None
+        if prof is not None:
+            prof.begin_frame()
+            events_start = time.perf_counter()
 
-    pygame.display.flip()
-    clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
 
-pygame.quit()
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_clicked = True
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    escape = True
+
+                if event.key == pygame.K_F3:
+                    profiler.enabled = not profiler.enabled
+                if event.key == pygame.K_F9:
+                    print(f"Frame profile written to {profiler.dump(PROFILE_PATH)}")
+
+                # Restart after game over
+                if sim.game_over and event.key == pygame.K_r:
+                    save_recording(sim, game_number)
+                    game_number += 1
+                    sim.close()
+                    sim = create_game(screen)
+                    stepper.reset()
+                    clock.tick()
+
+        if prof is not None:
+            prof.add("events", time.perf_counter() - events_start)
+
+        # ------------------ UPGRADE MENU ------------------
+        if sim.game_manager.show_upgrade and mouse_clicked:
+            upgrade = sim.game_manager.check_mouse_click(mouse_pos) or upgrade
+
+        # ------------------ GAME UPDATE ------------------
+        # Fixed-rate ticks: as many as the real time elapsed calls for
+        keys = pygame.key.get_pressed()
+        ticks = stepper.advance(frame_seconds)
+        for _ in range(ticks):
+            sim.step(TickInput.from_keys(keys, escape, upgrade),
+                     timer=prof.update_timer if prof else None)
+            escape = False
+            upgrade = 0
+
+        # ------------------ DRAW ------------------
+        draw_game(screen, sim, mouse_pos, timer=prof.draw_timer if prof else None,
+                  alpha=stepper.alpha)
+        if not startup.reported:
+            startup.mark("first game frame")
+            startup.print_once()
+
+        if prof is None:
+            pygame.display.flip()
+        else:
+            prof.draw_graph(screen)
+            prof.measure("flip", pygame.display.flip)
+            prof.end_frame(frame_seconds, ticks=ticks,
+                           enemies=len(sim.enemies), orbs=len(sim.xp_orbs))
+
+    save_recording(sim, game_number)
+    if os.environ.get("VAMP_PROFILE") and profiler.frames:
+        print(f"Frame profile written to {profiler.dump(PROFILE_PATH)}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
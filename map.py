@@ -1,8 +1,212 @@
 import pygame
+import queue
 import random
+import threading
+from collections import OrderedDict
+
+import themes
 from utils import WORLD_WIDTH, WORLD_HEIGHT
 
 
+CHUNK_SIZE = 1024                       # world pixels per cached chunk side
+CHUNK_BUDGET = 48 * 1024 * 1024         # bytes of chunk surfaces kept per store
+DECORATION_CHUNKS = 256                 # endless maps: chunks of decorations kept
+
+
+def _display_format(chunk):
+    """`chunk` in the display's pixel format; skips the copy if it already is."""
+    display = pygame.display.get_surface()
+    if display is None or (chunk.get_bitsize() == display.get_bitsize()
+                           and chunk.get_masks() == display.get_masks()):
+        return chunk
+    return chunk.convert()
+
+
+def _surface_bytes(surface):
+    return surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+
+class ChunkStore:
+    """
+    LRU of baked chunk surfaces, evicting the least recently used once
+    they exceed `budget` bytes. One store can back several ChunkCaches.
+    """
+    def __init__(self, budget=CHUNK_BUDGET):
+        self.budget = budget
+        self.surfaces = OrderedDict()   # key -> Surface
+        self.bytes = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.surfaces
+
+    def get(self, key):
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        self.discard(key)
+        size = _surface_bytes(surface)
+        while self.surfaces and self.bytes + size > self.budget:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+            self.evictions += 1
+
+        self.surfaces[key] = surface
+        self.bytes += size
+
+    def discard(self, key):
+        old = self.surfaces.pop(key, None)
+        if old is not None:
+            self.bytes -= _surface_bytes(old)
+
+
+# Baked chunks of every Map with a known (theme, seed): a restart, replay,
+# snapshot or benchmark on the same map reuses them instead of repainting,
+# and all maps of the session share one budget.
+baked_chunks = ChunkStore()
+
+
+class ChunkCache:
+    """
+    LRU cache of pre-rendered square world chunks.
+
+    build(cx, cy, surface) paints chunk (cx, cy), whose top-left corner is
+    at world (cx * chunk_size, cy * chunk_size). Chunks are built lazily
+    the first time they are visible and kept in `store` (a private
+    ChunkStore of `budget` bytes unless one is shared) under
+    prefix + (cx, cy); caches sharing a store and prefix share chunks.
+
+    prefetch() queues chunks to be built ahead of time on a background
+    thread (build must then be safe to call from that thread). The worker
+    only paints plain software Surfaces; matching them to the display
+    format (convert) touches the display and is left to get() on the
+    main thread. That
+    thread holds the cache (and whatever `build` belongs to) until
+    close() stops it.
+    """
+    def __init__(self, build, chunk_size=CHUNK_SIZE, budget=CHUNK_BUDGET, store=None,
+                 prefix=()):
+        self.build = build
+        self.chunk_size = chunk_size
+        self.store = store if store is not None else ChunkStore(budget)
+        self.prefix = tuple(prefix)
+
+        # background builds: finished chunks wait in `ready`
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pending = set()
+        self.ready = {}
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+    def get(self, cx, cy):
+        key = (cx, cy)
+        chunk = self.store.get(self.prefix + key)
+        if chunk is not None:
+            self.hits += 1
+            return chunk
+
+        with self._lock:
+            chunk = self.ready.pop(key, None)
+            # Still queued (or being built): build it here, the worker drops its copy
+            self._pending.discard(key)
+        if chunk is not None:
+            self.prefetched += 1
+        else:
+            self.misses += 1
+            chunk = pygame.Surface((self.chunk_size, self.chunk_size))
+            self.build(cx, cy, chunk)
+        chunk = _display_format(chunk)
+
+        self.store.put(self.prefix + key, chunk)
+        return chunk
+
+    def clear(self):
+        """Drop this cache's chunks (from a shared store too)."""
+        n = len(self.prefix)
+        for key in [k for k in self.store.surfaces if k[:n] == self.prefix]:
+            self.store.discard(key)
+        with self._lock:
+            self.ready.clear()
+            self._pending.clear()
+
+    # ------------- BACKGROUND BUILDS -------------
+    def prefetch(self, keys):
+        """Build these chunks on the worker thread if not cached yet."""
+        if self._queue is None:
+            self._queue = queue.Queue()
+            threading.Thread(target=self._worker, args=(self._queue,), daemon=True).start()
+
+        wanted = set(keys)
+        with self._lock:
+            # forget finished chunks the camera has already moved away from
+            for key in [k for k in self.ready if k not in wanted]:
+                del self.ready[key]
+            for key in wanted:
+                if (self.prefix + key not in self.store and key not in self.ready
+                        and key not in self._pending):
+                    self._pending.add(key)
+                    self._queue.put(key)
+
+    def close(self):
+        """Stop the worker thread; queued chunks are dropped."""
+        if self._queue is None:
+            return
+        with self._lock:
+            self._pending.clear()
+            self.ready.clear()
+        self._queue.put(None)       # sentinel: the worker exits
+        self._queue = None
+
+    def _worker(self, jobs):
+        while True:
+            key = jobs.get()
+            if key is None:
+                return
+            with self._lock:
+                if key not in self._pending:    # built by get() in the meantime
+                    continue
+            chunk = pygame.Surface((self.chunk_size, self.chunk_size))
+            self.build(key[0], key[1], chunk)
+            with self._lock:
+                # Keep it only if get() did not need it first
+                if key in self._pending and self.prefix + key not in self.store:
+                    self.ready[key] = chunk
+                self._pending.discard(key)
+
+    # ------------- DRAW -------------
+    def visible(self, offset_x, offset_y, width, height, margin=0):
+        """Chunk keys intersecting the view, grown by `margin` chunks."""
+        cs = self.chunk_size
+        first_cx = int(offset_x // cs) - margin
+        first_cy = int(offset_y // cs) - margin
+        last_cx = int((offset_x + width - 1) // cs) + margin
+        last_cy = int((offset_y + height - 1) // cs) + margin
+        return [(cx, cy) for cy in range(first_cy, last_cy + 1)
+                for cx in range(first_cx, last_cx + 1)]
+
+    def draw(self, surface, offset_x, offset_y, ahead=0):
+        """
+        Blit every chunk that intersects the view (usually 1-4 blits).
+        ahead: also prefetch chunks this many chunks beyond the view.
+        """
+        cs = self.chunk_size
+        width = surface.get_width()
+        height = surface.get_height()
+
+        for cx, cy in self.visible(offset_x, offset_y, width, height):
+            surface.blit(self.get(cx, cy), (cx * cs - offset_x, cy * cs - offset_y))
+
+        if ahead:
+            self.prefetch(self.visible(offset_x, offset_y, width, height, ahead))
+
+
 class Decoration:
     """
     Simple world decoration object (tree, rock, bush, etc.)
@@ -13,26 +217,17 @@ class Decoration:
         self.y = y
         self.dtype = dtype
 
-        if dtype == "tree":
-            self.color = (20, 120, 20)
-            self.radius = 20
-            self.has_trunk = True
-        elif dtype == "rock":
-            self.color = (130, 130, 130)
-            self.radius = 12
-            self.has_trunk = False
-        elif dtype == "bush":
-            self.color = (40, 160, 60)
-            self.radius = 15
-            self.has_trunk = False
-        elif dtype == "bone":  # for graveyard theme
-            self.color = (220, 220, 220)
-            self.radius = 10
-            self.has_trunk = False
-        else:
-            self.color = (255, 255, 255)
-            self.radius = 10
-            self.has_trunk = False
+        # Looks come from the decoration definitions (themes.json)
+        kind = themes.registry.decoration(dtype)
+        self.color = kind.color
+        self.radius = kind.radius
+        self.trunk_color = kind.trunk_color
+        self.has_trunk = kind.trunk_color is not None
+
+    def bounds(self):
+        """World-space rect covering everything draw_at() paints."""
+        r = self.radius
+        return pygame.Rect(self.x - r, self.y - r, 2 * r + 1, 2 * r + 5)
 
     def draw(self, surface, offset_x, offset_y):
         sx = int(self.x - offset_x)
@@ -44,13 +239,16 @@ class Decoration:
         if sy < -50 or sy > surface.get_height() + 50:
             return
 
+        self.draw_at(surface, sx, sy)
+
+    def draw_at(self, surface, sx, sy):
         pygame.draw.circle(surface, self.color, (sx, sy), self.radius)
 
         # simple tree trunk
         if self.has_trunk:
             pygame.draw.rect(
                 surface,
-                (90, 60, 40),
+                self.trunk_color,
                 (sx - 4, sy + self.radius - 6, 8, 10)
             )
 
@@ -59,50 +257,58 @@ class Map:
     """
     A map instance: holds theme, tile colors, and decorations.
 
-    Example types:
-      - "forest"
-      - "desert"
-      - "graveyard"
-    You can add more later easily.
+    Ground and decorations never change, so both are baked into cached
+    chunk surfaces (see ChunkCache); drawing the map costs one blit per
+    visible chunk however many decorations there are.
+
+    endless=True drops the fixed WORLD_WIDTH x WORLD_HEIGHT world: each
+    chunk's decorations come from a hash of (seed, cx, cy), chunks are
+    generated on demand (and ahead of the camera on a background thread)
+    and forgotten again when far away, so memory stays bounded however far
+    the player travels and the same seed always gives the same world.
+
+    Baked chunks go to the shared `baked_chunks` store under
+    (theme, seed, endless), so another Map of the same theme and seed
+    reuses them.
+
+    map_type names a theme from themes.json ("forest", "desert",
+    "graveyard", ...; see themes.py); unknown names get the default theme.
     """
-    def __init__(self, map_type="forest", seed=None):
+    def __init__(self, map_type="forest", seed=None, endless=False):
         self.map_type = map_type
-        self.tile_size = 80
+        self.endless = endless
+        if endless and seed is None:
+            seed = random.randint(0, 999999)
+        self.seed = seed
         self.rng = random.Random(seed)
         self.decorations = []
+        # Fixed maps: (cx, cy) -> decorations overlapping that chunk
+        # Endless maps: (cx, cy) -> decorations generated in that chunk (LRU)
+        self.chunk_decorations = OrderedDict() if endless else {}
+        self._deco_lock = threading.Lock()
 
         # Theme setup (tile colors + decoration settings)
         self._setup_theme()
-        # Generate random decorations over the whole world
-        self._generate_decorations()
+        # Fixed maps: generate random decorations over the whole world
+        if not endless:
+            self._generate_decorations()
+        # Pre-rendered ground + decorations, built lazily per chunk.
+        # Without a seed the layout is one-off, so its chunks are not shared.
+        if seed is None:
+            self.chunks = ChunkCache(self._build_chunk)
+        else:
+            self.chunks = ChunkCache(self._build_chunk, store=baked_chunks,
+                                     prefix=(self.theme, seed, endless))
 
     # ---------------- THEME SETUP ----------------
     def _setup_theme(self):
-        if self.map_type == "forest":
-            # ground colors
-            self.base_color = (30, 80, 30)
-            self.alt_color = (25, 70, 25)
-            self.decoration_types = ["tree", "tree", "bush", "rock"]
-            self.decoration_count = 140
-
-        elif self.map_type == "desert":
-            self.base_color = (180, 160, 80)
-            self.alt_color = (190, 170, 90)
-            self.decoration_types = ["rock", "rock", "bush"]
-            self.decoration_count = 90
-
-        elif self.map_type == "graveyard":
-            self.base_color = (40, 40, 60)
-            self.alt_color = (35, 35, 55)
-            self.decoration_types = ["rock", "bone", "bush"]
-            self.decoration_count = 110
-
-        else:
-            # default / unknown map type
-            self.base_color = (40, 80, 40)
-            self.alt_color = (35, 75, 35)
-            self.decoration_types = ["tree", "bush", "rock"]
-            self.decoration_count = 100
+        """Tile colors and decoration settings from the theme definition."""
+        theme = self.theme = themes.registry.theme(self.map_type)
+        self.tile_size = theme.tile_size
+        self.base_color = theme.base_color
+        self.alt_color = theme.alt_color
+        self.decoration_types = theme.decoration_types
+        self.decoration_count = theme.decoration_count
 
     # ------------- DECORATION GENERATION -------------
     def _generate_decorations(self):
@@ -114,26 +320,99 @@ class Map:
             dtype = self.rng.choice(self.decoration_types)
             self.decorations.append(Decoration(x, y, dtype))
 
-    # ------------- DRAW BACKGROUND TILES -------------
-    def draw_background(self, surface, offset_x, offset_y):
-        """
-        Draws large colored tiles for the ground.
-        Uses WORLD coordinates and camera offset.
-        """
-        tile = self.tile_size
-        width = surface.get_width()
-        height = surface.get_height()
+        self._index_decorations()
 
-        # Figure out which tiles are visible
-        start_x = int(offset_x // tile) * tile
-        start_y = int(offset_y // tile) * tile
+    def _index_decorations(self):
+        """Bucket decorations by every chunk their bounds touch."""
+        self.chunk_decorations.clear()
+        cs = CHUNK_SIZE
+        for deco in self.decorations:
+            b = deco.bounds()
+            for cy in range(b.top // cs, (b.bottom - 1) // cs + 1):
+                for cx in range(b.left // cs, (b.right - 1) // cs + 1):
+                    self.chunk_decorations.setdefault((cx, cy), []).append(deco)
+
+    # ------------- ENDLESS DECORATIONS -------------
+    def _chunk_seed(self, cx, cy):
+        return f"{self.seed}:{cx}:{cy}"
+
+    def _generated_decorations(self, cx, cy):
+        """Decorations whose position lies in chunk (cx, cy) (endless maps)."""
+        key = (cx, cy)
+        with self._deco_lock:
+            decos = self.chunk_decorations.get(key)
+            if decos is not None:
+                self.chunk_decorations.move_to_end(key)
+                return decos
+
+        # Same density as the fixed world
+        cs = CHUNK_SIZE
+        count = round(self.decoration_count * cs * cs / (WORLD_WIDTH * WORLD_HEIGHT))
+        rng = random.Random(self._chunk_seed(cx, cy))
+        decos = []
+        for _ in range(count):
+            x = cx * cs + rng.randrange(cs)
+            y = cy * cs + rng.randrange(cs)
+            decos.append(Decoration(x, y, rng.choice(self.decoration_types)))
+
+        with self._deco_lock:
+            self.chunk_decorations[key] = decos
+            while len(self.chunk_decorations) > DECORATION_CHUNKS:
+                self.chunk_decorations.popitem(last=False)
+        return decos
+
+    def decorations_in_chunk(self, cx, cy):
+        """Every decoration overlapping chunk (cx, cy), in draw order."""
+        if not self.endless:
+            return self.chunk_decorations.get((cx, cy), ())
+
+        # Decorations can spill over from the neighbouring chunks
+        cs = CHUNK_SIZE
+        area = pygame.Rect(cx * cs, cy * cs, cs, cs)
+        found = []
+        for ny in (cy - 1, cy, cy + 1):
+            for nx in (cx - 1, cx, cx + 1):
+                for deco in self._generated_decorations(nx, ny):
+                    if area.colliderect(deco.bounds()):
+                        found.append(deco)
+        return found
+
+    def decorations_in_rect(self, rect):
+        """Every decoration overlapping a world rect (each once)."""
+        area = pygame.Rect(rect)
+        cs = CHUNK_SIZE
+        seen = set()
+        found = []
+        for cy in range(area.top // cs, (area.bottom - 1) // cs + 1):
+            for cx in range(area.left // cs, (area.right - 1) // cs + 1):
+                for deco in self.decorations_in_chunk(cx, cy):
+                    if id(deco) not in seen and area.colliderect(deco.bounds()):
+                        seen.add(id(deco))
+                        found.append(deco)
+        return found
+
+    # ------------- CHUNK BAKING -------------
+    def _build_chunk(self, cx, cy, chunk):
+        self._build_ground_chunk(cx, cy, chunk)
+
+        # Decorations in generation order, same as the old per-frame loop
+        x0 = cx * chunk.get_width()
+        y0 = cy * chunk.get_height()
+        for deco in self.decorations_in_chunk(cx, cy):
+            deco.draw_at(chunk, deco.x - x0, deco.y - y0)
 
-        for gx in range(start_x, start_x + width + tile, tile):
-            for gy in range(start_y, start_y + height + tile, tile):
-                # Screen-space position
-                sx = gx - offset_x
-                sy = gy - offset_y
+    def _build_ground_chunk(self, cx, cy, chunk):
+        """Paint the checkerboard tiles covering chunk (cx, cy)."""
+        tile = self.tile_size
+        size = chunk.get_width()
+        x0 = cx * size
+        y0 = cy * size
+
+        start_x = (x0 // tile) * tile
+        start_y = (y0 // tile) * tile
 
+        for gx in range(start_x, x0 + size, tile):
+            for gy in range(start_y, y0 + size, tile):
                 # checkerboard / variation
                 ix = gx // tile
                 iy = gy // tile
@@ -142,9 +421,23 @@ class Map:
                 else:
                     color = self.alt_color
 
-                pygame.draw.rect(surface, color, (sx, sy, tile, tile))
+                chunk.fill(color, (gx - x0, gy - y0, tile, tile))
+
+    def close(self):
+        """Stop background chunk building; call when the map is discarded."""
+        self.chunks.close()
+
+    # ------------- DRAW BACKGROUND TILES -------------
+    def draw_background(self, surface, offset_x, offset_y):
+        """
+        Draws large colored tiles for the ground.
+        Uses WORLD coordinates and camera offset. The checkerboard (and
+        the decorations on it) never change, so they are pre-rendered into
+        cached chunks and each frame only blits the chunks the camera sees.
+        """
+        self.chunks.draw(surface, offset_x, offset_y, ahead=1 if self.endless else 0)
 
     # ------------- DRAW DECORATIONS -------------
     def draw_decorations(self, surface, offset_x, offset_y):
-        for deco in self.decorations:
-            deco.draw(surface, offset_x, offset_y)
+        """Decorations are baked into the chunks drawn by draw_background."""
+        pass
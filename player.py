@@ -1,5 +1,7 @@
 import pygame
 from utils import WORLD_WIDTH, WORLD_HEIGHT
+from text_cache import render_text
+from ui_layers import Layer
 
 
 class Player(pygame.sprite.Sprite):
@@ -18,6 +20,9 @@ class Player(pygame.sprite.Sprite):
         self.base_damage = 10
         self.base_range = 120
 
+        # World rect the player is kept inside (None on endless maps)
+        self.bounds = pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT)
+
         # -------------------------
         # XP & Leveling System
         # -------------------------
@@ -35,6 +40,9 @@ class Player(pygame.sprite.Sprite):
         # Total XP gained (used for XP bar text)
         self.xp_total = 0
 
+        # Cached XP bar (built on first draw)
+        self.xp_bar_layer = None
+
         # -------------------------
         # Sprite
         # -------------------------
@@ -45,19 +53,29 @@ class Player(pygame.sprite.Sprite):
     # -------------------------------------------------
     # MOVEMENT
     # -------------------------------------------------
-    def update(self):
+    def update(self, move=None):
+        """
+        Move the player.
+        move: optional (dx, dy) direction in -1..1 (headless / scripted
+        input). When omitted the keyboard is read.
+        """
         if not self.is_alive():
             return
 
-        keys = pygame.key.get_pressed()
-        dx = (keys[pygame.K_d] - keys[pygame.K_a]) * self.speed
-        dy = (keys[pygame.K_s] - keys[pygame.K_w]) * self.speed
+        if move is None:
+            keys = pygame.key.get_pressed()
+            move = (keys[pygame.K_d] - keys[pygame.K_a],
+                    keys[pygame.K_s] - keys[pygame.K_w])
+
+        dx = move[0] * self.speed
+        dy = move[1] * self.speed
 
         self.rect.x += dx
         self.rect.y += dy
 
         # Stay inside world bounds
-        self.rect.clamp_ip(pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT))
+        if self.bounds is not None:
+            self.rect.clamp_ip(self.bounds)
 
     # -------------------------------------------------
     # XP SYSTEM
@@ -124,28 +142,38 @@ class Player(pygame.sprite.Sprite):
         # -------------------------------
         # XP BAR (FULL WIDTH BOTTOM)
         # -------------------------------
-        xp_ratio = min(self.xp / self.xp_required, 1.0)
+        # Cached; re-rendered only when XP / level (or screen size) change
         screen_w = surface.get_width()
         screen_h = surface.get_height()
+        layer = self.xp_bar_layer
+        if layer is None or layer.rect.size != (screen_w, 25):
+            layer = self.xp_bar_layer = Layer((0, screen_h - 25, screen_w, 25),
+                                              self._render_xp_bar, transparent=False)
+        layer.rect.bottom = screen_h
+        layer.draw(surface, (self.xp, self.xp_required, self.xp_total, self.level))
+
+    def _render_xp_bar(self, surface, key):
+        xp, xp_required, xp_total, level = key
+        xp_ratio = min(xp / xp_required, 1.0)
+        w, h = surface.get_size()
 
-        pygame.draw.rect(surface, (40, 40, 40), (0, screen_h - 25, screen_w, 25))
-        pygame.draw.rect(surface, (80, 150, 255),
-                         (0, screen_h - 25, screen_w * xp_ratio, 25))
+        surface.fill((40, 40, 40))
+        pygame.draw.rect(surface, (80, 150, 255), (0, 0, w * xp_ratio, h))
 
         # XP TEXT
-        font = pygame.font.Font(None, 28)
-        txt = font.render(
-            f"XP: {self.xp_total} (Lvl {self.level})  [{self.xp}/{self.xp_required}]",
-            True, (255, 255, 255)
+        txt = render_text(
+            f"XP: {xp_total} (Lvl {level})  [{xp}/{xp_required}]",
+            28, (255, 255, 255)
         )
-        surface.blit(txt, (10, screen_h - 23))
+        surface.blit(txt, (10, 2))
 
     # -------------------------------------------------
     # MINIMAP DOT
     # -------------------------------------------------
-    def draw_minimap(self, surface, rect):
-        mini_x = int((self.rect.centerx / WORLD_WIDTH) * rect.width)
-        mini_y = int((self.rect.centery / WORLD_HEIGHT) * rect.height)
+    def draw_minimap(self, surface, rect, origin=(0, 0)):
+        """origin: world point shown at the minimap's top-left corner."""
+        mini_x = int(((self.rect.centerx - origin[0]) / WORLD_WIDTH) * rect.width)
+        mini_y = int(((self.rect.centery - origin[1]) / WORLD_HEIGHT) * rect.height)
 
         pygame.draw.circle(surface, (0, 255, 0),
                            (rect.x + mini_x, rect.y + mini_y), 3)
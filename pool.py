@@ -0,0 +1,82 @@
+class Pool:
+    """
+    Free list of reusable objects of one class.
+
+    acquire(*args) hands back a released object re-initialized through its
+    reset(*args), or builds cls(*args) when the free list is empty.
+    release(obj) returns an object once it is dead (killed / collected);
+    releasing twice is ignored.
+    """
+    def __init__(self, cls, max_free=4096):
+        self.cls = cls
+        self.max_free = max_free
+        self.free = []
+
+        # Stats
+        self.created = 0
+        self.reused = 0
+        self.live = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        obj.pooled = False
+
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return obj
+
+    def release(self, obj):
+        if getattr(obj, "pooled", True):
+            return      # already released, or never came from a pool
+        obj.pooled = True
+        self.live -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def stats(self):
+        acquired = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "reuse_ratio": self.reused / acquired if acquired else 0.0,
+        }
+
+
+# --------------------------------------------
+# SHARED POOLS (one per class)
+# --------------------------------------------
+pools = {}
+
+
+def pool_for(cls):
+    pool = pools.get(cls)
+    if pool is None:
+        pool = pools[cls] = Pool(cls)
+    return pool
+
+
+def acquire(cls, *args):
+    """cls(*args), reusing a released instance when one is free."""
+    return pool_for(cls).acquire(*args)
+
+
+def release(obj):
+    """Give a dead pooled object back (no-op for non-pooled objects)."""
+    pool = pools.get(type(obj))
+    if pool is not None:
+        pool.release(obj)
+
+
+def pool_stats():
+    return {cls.__name__: pool.stats() for cls, pool in pools.items()}
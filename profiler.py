@@ -0,0 +1,148 @@
+"""
+Frame profiler for the windowed game.
+
+Per-phase timings of every frame go into a fixed-size ring buffer (one
+row per frame, one column per phase), with entity counts alongside. It
+plugs into the same timer(name, phase, *args) hook as the benchmarks
+(Simulation.step / renderer.draw_game); when it is off main.py passes no
+timer at all, so the disabled cost is one flag check per frame.
+
+    VAMP_PROFILE=1 python main.py              # on from the start, dump on quit
+    VAMP_PROFILE_OUT=frames.json python main.py
+    F3 toggles profiling + graph, F9 dumps the buffer.
+"""
+import csv
+import json
+import os
+import time
+
+import numpy as np
+import pygame
+
+from text_cache import get_font
+
+
+COUNTS = ("ticks", "enemies", "orbs")
+FRAME_BUDGET_MS = 1000.0 / 60
+
+
+class FrameProfiler:
+    """
+    Ring buffer of per-frame phase timings (milliseconds).
+    Call begin_frame(), time phases with add()/measure() or the
+    update_timer / draw_timer hooks, then end_frame(...).
+    """
+    def __init__(self, phases=(), capacity=600, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.columns = ["work_ms", "interval_ms"] + list(COUNTS)
+        self.columns += [name for name in phases if name not in self.columns]
+        self._column = {name: i for i, name in enumerate(self.columns)}
+        self.data = np.zeros((capacity, len(self.columns)))
+        self.frames = 0
+        self._row = self.data[0]
+        self._start = 0.0
+
+        # Hooks for Simulation.step(timer=) and draw_game(timer=)
+        self.update_timer = self._prefixed("update.")
+        self.draw_timer = self._prefixed("draw.")
+
+    @classmethod
+    def from_env(cls, phases=()):
+        return cls(phases, enabled=bool(os.environ.get("VAMP_PROFILE")))
+
+    def _add_column(self, name):
+        """Phases not known up front get a column on first use."""
+        self._column[name] = len(self.columns)
+        self.columns.append(name)
+        self.data = np.hstack([self.data, np.zeros((self.capacity, 1))])
+        self._row = self.data[self.frames % self.capacity]
+        return self._column[name]
+
+    def _prefixed(self, prefix):
+        def timer(name, phase, *args):
+            self.measure(prefix + name, phase, *args)
+        return timer
+
+    # ------------------------------------------------------------
+    # RECORDING
+    # ------------------------------------------------------------
+    def begin_frame(self):
+        self._row = self.data[self.frames % self.capacity]
+        self._row[:] = 0.0
+        self._start = time.perf_counter()
+
+    def add(self, name, seconds):
+        column = self._column.get(name)
+        if column is None:
+            column = self._add_column(name)
+        self._row[column] += seconds * 1000.0     # several ticks can share a frame
+
+    def measure(self, name, phase, *args):
+        start = time.perf_counter()
+        phase(*args)
+        self.add(name, time.perf_counter() - start)
+
+    def end_frame(self, interval=0.0, **counts):
+        row = self._row
+        row[0] = (time.perf_counter() - self._start) * 1000.0
+        row[1] = interval * 1000.0
+        for name, value in counts.items():
+            row[self._column[name]] = value
+        self.frames += 1
+
+    # ------------------------------------------------------------
+    # READING / DUMPING
+    # ------------------------------------------------------------
+    def rows(self):
+        """Recorded frames, oldest first (at most `capacity`)."""
+        n = min(self.frames, self.capacity)
+        start = self.frames - n
+        order = (np.arange(n) + start) % self.capacity
+        return self.data[order]
+
+    def dump(self, path):
+        """Write the buffer as CSV, or JSON if `path` ends in .json."""
+        rows = self.rows()
+        first = self.frames - len(rows)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"columns": self.columns, "first_frame": first,
+                           "frames": rows.round(4).tolist()}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + self.columns)
+                for i, row in enumerate(rows.round(4).tolist()):
+                    writer.writerow([first + i] + row)
+        return path
+
+    # ------------------------------------------------------------
+    # IN-GAME GRAPH
+    # ------------------------------------------------------------
+    def draw_graph(self, surface, width=240, height=100, ms_per_px=0.25):
+        """Bar graph of recent frame work time plus a stats line, bottom-left."""
+        rows = self.rows()[-width:]
+        if len(rows) == 0:
+            return
+        x0 = 10
+        y0 = surface.get_height() - 40 - height
+
+        pygame.draw.rect(surface, (0, 0, 0), (x0, y0, width, height))
+        work = rows[:, 0]
+        for i, ms in enumerate(work.tolist()):
+            h = min(int(ms / ms_per_px), height)
+            color = ((80, 220, 80) if ms < FRAME_BUDGET_MS
+                     else (230, 200, 60) if ms < 2 * FRAME_BUDGET_MS else (230, 60, 60))
+            pygame.draw.line(surface, color, (x0 + i, y0 + height - 1),
+                             (x0 + i, y0 + height - h))
+        budget_y = y0 + height - int(FRAME_BUDGET_MS / ms_per_px)
+        pygame.draw.line(surface, (255, 255, 255), (x0, budget_y), (x0 + width, budget_y))
+
+        last = rows[-1]
+        text = (f"{work.mean():.1f} ms avg  {work.max():.1f} max  "
+                f"{int(last[self._column['enemies']])} enemies  "
+                f"{int(last[self._column['orbs']])} orbs")
+        # New text almost every frame: render it directly rather than
+        # churning the shared text cache the HUD and menus rely on
+        surface.blit(get_font(22).render(text, True, (255, 255, 255)), (x0, y0 - 18))
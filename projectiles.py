@@ -0,0 +1,282 @@
+"""
+Batched projectiles shared by all of a player's weapons.
+
+Nothing fires through this on its own. The weapon classes live outside
+this tree (Weapon/, see weapon_registry.py), and each one still moves and
+hit-tests its own Bullet objects unless it opts in. To opt in, a weapon
+spawns its shots on the player's ProjectileSystem
+(WeaponManager sets player.projectiles) and drops its own Bullet list:
+
+    shots = getattr(self.player, "projectiles", None)
+    if shots is not None:
+        shots.spawn(x, y, angle, damage)                  # one shot
+        shots.spawn_many(x, y, angles, damage, speed=12)  # a volley
+    else:
+        self.bullets.append(Bullet(x, y, angle))          # old path
+
+WeaponManager moves, hit-tests and draws those shots once per tick for
+all weapons. Only weapons that opt in save the per-Bullet cost.
+"""
+import math
+
+import numpy as np
+import pygame
+
+from bullet import Bullet, BULLET_COLOR
+from sprite_atlas import circle_sprite
+
+
+ENEMY_RADIUS = 10       # enemies are 20x20 boxes; hits treat them as circles
+BULLET_SPEED = 18
+BULLET_RADIUS = 7
+MUZZLE_OFFSET = 45      # same spawn distance from the shooter as Bullet
+
+
+class ProjectileSystem:
+    """
+    NumPy struct-of-arrays projectiles (bullets, shuriken, ...).
+
+    Position, velocity, radius, damage and remaining lifetime live in
+    parallel arrays. update() moves every projectile in one step, resolves
+    hits with one batched broadphase query against the enemies and drops
+    spent / out-of-bounds projectiles with a single compaction, instead of
+    a Bullet object per shot with its own update / off_screen / hit loop.
+
+    Hits are swept: the test uses the segment travelled this tick, so an
+    18 px/tick projectile cannot step over a 20 px enemy. A projectile is
+    used up by its first hit (the nearest along its path).
+    """
+    ARRAYS = ("x", "y", "vx", "vy", "radius", "damage", "life")
+    # Positions at the start of the tick, for interpolated drawing only
+    PREV_ARRAYS = ("prev_x", "prev_y")
+
+    def __init__(self, capacity=256, bounds=None):
+        self.count = 0
+        self.capacity = 0
+        # (left, top, right, bottom) or None (endless: lifetime only)
+        self.bounds = bounds
+
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.vx = np.zeros(0, dtype=np.float64)
+        self.vy = np.zeros(0, dtype=np.float64)
+        self.radius = np.zeros(0, dtype=np.float64)
+        self.damage = np.zeros(0, dtype=np.float64)
+        self.life = np.zeros(0, dtype=np.int32)
+        self.prev_x = np.zeros(0, dtype=np.float64)
+        self.prev_y = np.zeros(0, dtype=np.float64)
+        self._grow(capacity)
+
+        # Stats
+        self.fired = 0
+        self.hits = 0
+
+    def _grow(self, capacity):
+        for name in self.ARRAYS + self.PREV_ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def mark_previous(self):
+        """Remember the current positions as the tick's start (see prev_x)."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    # ------------------------------------------------------------
+    # FIRING
+    # ------------------------------------------------------------
+    def spawn(self, x, y, angle, damage, speed=BULLET_SPEED, radius=BULLET_RADIUS,
+              lifetime=None, offset=MUZZLE_OFFSET):
+        """
+        Fire one projectile from (x, y) along `angle` (radians).
+        lifetime: ticks before it expires; default Bullet.MAX_TRAVEL of travel.
+        """
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        if lifetime is None:
+            lifetime = int(Bullet.MAX_TRAVEL // speed)
+        cos, sin = math.cos(angle), math.sin(angle)
+        i = self.count
+        self.x[i] = self.prev_x[i] = x + cos * offset
+        self.y[i] = self.prev_y[i] = y + sin * offset
+        self.vx[i] = cos * speed
+        self.vy[i] = sin * speed
+        self.radius[i] = radius
+        self.damage[i] = damage
+        self.life[i] = lifetime
+        self.count += 1
+        self.fired += 1
+        return i
+
+    def spawn_many(self, x, y, angles, damage, speed=BULLET_SPEED, radius=BULLET_RADIUS,
+                   lifetime=None, offset=MUZZLE_OFFSET):
+        """spawn() for a whole volley (e.g. a ring of shots) from one point."""
+        angles = np.asarray(angles, dtype=np.float64)
+        k = len(angles)
+        if self.count + k > self.capacity:
+            self._grow(max(self.capacity * 2, self.count + k))
+        if lifetime is None:
+            lifetime = int(Bullet.MAX_TRAVEL // speed)
+        cos, sin = np.cos(angles), np.sin(angles)
+        sel = slice(self.count, self.count + k)
+        self.x[sel] = self.prev_x[sel] = x + cos * offset
+        self.y[sel] = self.prev_y[sel] = y + sin * offset
+        self.vx[sel] = cos * speed
+        self.vy[sel] = sin * speed
+        self.radius[sel] = radius
+        self.damage[sel] = damage
+        self.life[sel] = lifetime
+        self.count += k
+        self.fired += k
+
+    # ------------------------------------------------------------
+    # UPDATE
+    # ------------------------------------------------------------
+    def update(self, enemies):
+        """Move, hit enemies, then drop spent projectiles. Returns hits."""
+        n = self.count
+        if n == 0:
+            return 0
+
+        x0 = self.x[:n].copy()
+        y0 = self.y[:n].copy()
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+
+        hit = self._collide(enemies, x0, y0) if enemies is not None and len(enemies) else None
+
+        keep = self.life[:n] > 0
+        if hit is not None:
+            keep &= ~hit
+        if self.bounds is not None:
+            left, top, right, bottom = self.bounds
+            x = self.x[:n]
+            y = self.y[:n]
+            keep &= (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+
+        alive = int(np.count_nonzero(keep))
+        if alive < n:
+            for name in self.ARRAYS + self.PREV_ARRAYS:
+                arr = getattr(self, name)
+                arr[:alive] = arr[:n][keep]
+            self.count = alive
+        return 0 if hit is None else int(np.count_nonzero(hit))
+
+    def _collide(self, enemies, x0, y0):
+        """
+        Swept hit test of this tick's moves (x0, y0) -> (x, y).
+        Applies damage and returns the mask of projectiles that hit.
+        """
+        n = self.count
+        x1 = self.x[:n]
+        y1 = self.y[:n]
+        reach = self.radius[:n] + ENEMY_RADIUS
+        bx0 = np.minimum(x0, x1) - reach
+        by0 = np.minimum(y0, y1) - reach
+        bx1 = np.maximum(x0, x1) + reach
+        by1 = np.maximum(y0, y1) + reach
+
+        # Broadphase: (projectile, enemy) candidate pairs
+        store = enemies if hasattr(enemies, "grid") else None
+        if store is not None:
+            p, e = store.grid.pairs_in_rects(bx0, by0, bx1, by1)
+            # enemies spawned after the last reindex() are not in the grid
+            live = e < store.count
+            p, e = p[live], e[live]
+            live = (store.health[e] > 0) & ~store.killed[e]
+            p, e = p[live], e[live]
+            ex = store.x[e]
+            ey = store.y[e]
+        else:
+            p, targets, ex, ey = self._sprite_pairs(enemies, bx0, by0, bx1, by1)
+        if len(p) == 0:
+            return None
+
+        # Narrowphase: closest point of the swept segment to each enemy
+        sx = (x1 - x0)[p]
+        sy = (y1 - y0)[p]
+        fx = ex - x0[p]
+        fy = ey - y0[p]
+        seg2 = sx * sx + sy * sy
+        t = np.clip(np.divide(fx * sx + fy * sy, seg2, out=np.zeros(len(p)), where=seg2 > 0),
+                    0.0, 1.0)
+        cx = fx - t * sx
+        cy = fy - t * sy
+        touching = cx * cx + cy * cy <= reach[p] ** 2
+        if not touching.any():
+            return None
+        p, t = p[touching], t[touching]
+
+        # First enemy along each projectile's path
+        order = np.lexsort((t, p))
+        p = p[order]
+        first = np.flatnonzero(np.r_[True, p[1:] != p[:-1]])
+        hit_p = p[first]
+        pick = np.flatnonzero(touching)[order[first]]
+        damage = self.damage[hit_p]
+
+        if store is not None:
+            np.subtract.at(store.health, e[pick], damage)
+        else:
+            for i, dmg in zip(pick.tolist(), damage.tolist()):
+                targets[i].health -= dmg
+
+        hit = np.zeros(n, dtype=bool)
+        hit[hit_p] = True
+        self.hits += len(hit_p)
+        return hit
+
+    @staticmethod
+    def _sprite_pairs(enemies, bx0, by0, bx1, by1):
+        """Candidate pairs from a sprite Group (query_rect broadphase if it has one)."""
+        p, targets, ex, ey = [], [], [], []
+        indexed = hasattr(enemies, "query_rect")
+        scan = None if indexed else [e for e in enemies if e.health > 0]
+        for i, (left, top, right, bottom) in enumerate(
+                zip(bx0.tolist(), by0.tolist(), bx1.tolist(), by1.tolist())):
+            found = (enemies.query_rect((left, top, right - left, bottom - top)) if indexed
+                     else scan)
+            for enemy in found:
+                cx, cy = enemy.rect.center
+                if left <= cx < right and top <= cy < bottom and enemy.health > 0:
+                    p.append(i)
+                    targets.append(enemy)
+                    ex.append(cx)
+                    ey.append(cy)
+        return (np.array(p, dtype=np.intp), targets,
+                np.array(ex, dtype=np.float64), np.array(ey, dtype=np.float64))
+
+    # ------------------------------------------------------------
+    # DRAW
+    # ------------------------------------------------------------
+    def draw(self, surface, ox, oy, view=None):
+        """
+        Blit every projectile in one Surface.blits call.
+        view: optional world Rect; projectiles outside it are skipped.
+        Returns the number drawn.
+        """
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        r = self.radius[:n].astype(np.int64)
+        if view is not None:
+            view = pygame.Rect(view)
+            on = (x >= view.left) & (x < view.right) & (y >= view.top) & (y < view.bottom)
+            x, y, r = x[on], y[on], r[on]
+
+        left = (x - ox).astype(np.int64) - r
+        top = (y - oy).astype(np.int64) - r
+        items = [(circle_sprite(BULLET_COLOR, radius), (lx, ty))
+                 for lx, ty, radius in zip(left.tolist(), top.tolist(), r.tolist())]
+        surface.blits(items, doreturn=False)
+        return len(items)
@@ -0,0 +1,282 @@
+import numpy as np
+import pygame
+
+from bullet import Bullet
+from utils import WORLD_WIDTH, WORLD_HEIGHT
+from enemy import draw_enemies as blit_enemies
+from xp_orb import draw_orbs as blit_orbs
+
+
+# --------------------------------------------------------
+# MINIMAP
+# --------------------------------------------------------
+MINIMAP_SIZE = 180
+MINIMAP_MARGIN = 20
+MINIMAP_BIN = 3          # minimap pixels per density cell
+MINIMAP_REFRESH = 6      # frames between density rebuilds
+
+
+class Minimap:
+    """
+    Enemy density minimap. Every `refresh` frames the enemy positions are
+    binned into a histogram in one NumPy pass and written into a cached
+    surface with surfarray; in between only that surface is blitted. The
+    player marker is drawn live on top every frame.
+    """
+    def __init__(self, size=MINIMAP_SIZE, bin_size=MINIMAP_BIN, refresh=MINIMAP_REFRESH):
+        self.size = size
+        self.bin_size = bin_size
+        self.bins = size // bin_size
+        self.refresh = refresh
+        self.image = None
+        self.origin = (0, 0)
+        self.frame = 0
+        self.rebuilds = 0
+
+    @staticmethod
+    def positions(enemies):
+        """Enemy centers as two float arrays (EnemyStore or sprite group)."""
+        if hasattr(enemies, "x"):
+            n = enemies.count
+            return enemies.x[:n], enemies.y[:n]
+        pts = np.array([e.rect.center for e in enemies], dtype=np.float64).reshape(-1, 2)
+        return pts[:, 0], pts[:, 1]
+
+    def rebuild(self, enemies, origin):
+        bins = self.bins
+        x, y = self.positions(enemies)
+        bx = ((x - origin[0]) * (bins / WORLD_WIDTH)).astype(np.int64)
+        by = ((y - origin[1]) * (bins / WORLD_HEIGHT)).astype(np.int64)
+        inside = (bx >= 0) & (bx < bins) & (by >= 0) & (by < bins)
+        counts = np.bincount(bx[inside] * bins + by[inside],
+                             minlength=bins * bins).reshape(bins, bins)
+
+        # background (10,10,10); occupied cells go brighter red with density
+        pixels = np.full((bins, bins, 3), 10, dtype=np.uint8)
+        occupied = counts > 0
+        pixels[occupied, 0] = np.minimum(96 + counts[occupied] * 40, 255)
+        pixels[occupied, 1:] = 0
+
+        if self.image is None:
+            self.image = pygame.Surface((self.size, self.size))
+        scaled = pixels.repeat(self.bin_size, axis=0).repeat(self.bin_size, axis=1)
+        self.image.fill((10, 10, 10))
+        pygame.surfarray.blit_array(self.image.subsurface((0, 0) + scaled.shape[:2]), scaled)
+        pygame.draw.rect(self.image, (255, 255, 255), self.image.get_rect(), 2)
+
+        self.origin = origin
+        self.rebuilds += 1
+
+    def draw(self, surface, player, enemies, endless=False):
+        rect = pygame.Rect(surface.get_width() - self.size - MINIMAP_MARGIN,
+                           MINIMAP_MARGIN, self.size, self.size)
+
+        if self.image is None or self.frame % self.refresh == 0:
+            # Endless maps show a world-sized window centered on the player
+            if endless:
+                origin = (player.rect.centerx - WORLD_WIDTH // 2,
+                          player.rect.centery - WORLD_HEIGHT // 2)
+            else:
+                origin = (0, 0)
+            self.rebuild(enemies, origin)
+        self.frame += 1
+
+        surface.blit(self.image, rect.topleft)
+
+        # --- Player dot (live, same origin as the density) ---
+        player.draw_minimap(surface, rect, self.origin)
+
+
+# --------------------------------------------------------
+# VIEW CULLING
+# --------------------------------------------------------
+# Entities are looked up in their spatial index by the camera rect, so
+# off-screen ones (e.g. fresh spawns outside SPAWN_MARGIN) cost nothing.
+CULL_MARGIN = 32    # indexes hold centers; covers sprite extents / HP bars
+
+
+class CullStats:
+    """Drawn / culled counts per layer: last frame and running totals."""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frame = {}
+        self.totals = {}
+
+    def record(self, layer, drawn, total):
+        culled = total - drawn
+        self.frame[layer] = (drawn, culled)
+        t = self.totals.setdefault(layer, [0, 0, 0])
+        t[0] += drawn
+        t[1] += culled
+        t[2] += 1
+
+    def summary(self):
+        """Mean drawn / culled per frame for each layer."""
+        return {layer: {"drawn": d / n, "culled": c / n}
+                for layer, (d, c, n) in self.totals.items()}
+
+
+cull_stats = CullStats()
+
+
+def view_rect(surface, sim):
+    """World rect on screen, grown by CULL_MARGIN."""
+    return pygame.Rect(int(sim.camera.x) - CULL_MARGIN, int(sim.camera.y) - CULL_MARGIN,
+                       surface.get_width() + 2 * CULL_MARGIN,
+                       surface.get_height() + 2 * CULL_MARGIN)
+
+
+# --------------------------------------------------------
+# DRAW PHASES
+# --------------------------------------------------------
+# Each phase draws one layer of the frame: phase(surface, sim, mouse_pos).
+def draw_background(surface, sim, mouse_pos):
+    sim.game_map.draw_background(surface, sim.camera.x, sim.camera.y)
+
+
+def draw_decorations(surface, sim, mouse_pos):
+    sim.game_map.draw_decorations(surface, sim.camera.x, sim.camera.y)
+
+
+def draw_enemies(surface, sim, mouse_pos):
+    ox, oy = sim.camera.x, sim.camera.y
+    view = view_rect(surface, sim)
+    if sim.enemy_backend == "array":
+        visible = sim.enemies.visible(view)
+        sim.enemies.draw(surface, ox, oy, visible)
+    else:
+        visible = sim.enemies.query_rect(view)
+        blit_enemies(surface, visible, ox, oy)
+    cull_stats.record("enemies", len(visible), len(sim.enemies))
+
+
+def draw_orbs(surface, sim, mouse_pos):
+    visible = sim.xp_orbs.query_rect(view_rect(surface, sim))
+    blit_orbs(surface, visible, sim.camera.x, sim.camera.y)
+    cull_stats.record("orbs", len(visible), len(sim.xp_orbs))
+
+
+def draw_player(surface, sim, mouse_pos):
+    sim.player.draw(surface, sim.camera.x, sim.camera.y)
+
+
+def draw_weapons(surface, sim, mouse_pos):
+    drawn = sim.weapon_manager.draw(surface, sim.camera.x, sim.camera.y,
+                                    view_rect(surface, sim))
+    cull_stats.record("projectiles", drawn, len(sim.weapon_manager.projectiles))
+
+
+def draw_minimap_phase(surface, sim, mouse_pos):
+    sim.minimap.draw(surface, sim.player, sim.enemies, sim.game_map.endless)
+
+
+def draw_ui(surface, sim, mouse_pos):
+    sim.game_manager.draw(surface, sim.player, mouse_pos)
+
+
+DRAW_PHASES = [
+    ("background", draw_background),
+    ("decorations", draw_decorations),
+    ("enemies", draw_enemies),
+    ("orbs", draw_orbs),
+    ("player", draw_player),
+    ("weapons", draw_weapons),
+    ("minimap", draw_minimap_phase),
+    ("ui", draw_ui),
+]
+
+
+# --------------------------------------------------------
+# DRAW ONE FRAME
+# --------------------------------------------------------
+def draw_game(surface, sim, mouse_pos, timer=None, alpha=1.0):
+    """
+    Draw a full frame of `sim` onto `surface`.
+    timer: optional callable timer(name, phase, *args), see Simulation.step.
+    alpha: position between the previous (0) and the current (1) tick; the
+    camera and every moving entity are drawn interpolated (see FixedTimestep).
+    """
+    restore = _interpolate(surface, sim, alpha) if alpha < 1.0 and not sim.paused else None
+    try:
+        if timer is None:
+            for _, phase in DRAW_PHASES:
+                phase(surface, sim, mouse_pos)
+        else:
+            for name, phase in DRAW_PHASES:
+                timer(name, phase, surface, sim, mouse_pos)
+    finally:
+        if restore is not None:
+            restore()
+
+
+# Anything that moved farther than this in one tick was placed (spawned,
+# recycled, reused from a pool) rather than moved: it is drawn where it is.
+MAX_LERP_STEP = 64
+
+
+def _lerp_arrays(owner, alpha):
+    """Swap owner.x / owner.y for positions between prev_x / prev_y and them."""
+    n = owner.count
+    x, y = owner.x, owner.y
+    dx = x[:n] - owner.prev_x[:n]
+    dy = y[:n] - owner.prev_y[:n]
+    back = np.where((np.abs(dx) > MAX_LERP_STEP) | (np.abs(dy) > MAX_LERP_STEP), 0.0, alpha - 1.0)
+    owner.x = x[:n] + dx * back
+    owner.y = y[:n] + dy * back
+    return x, y
+
+
+def _interpolate(surface, sim, alpha):
+    """
+    Move the camera and every entity on screen between their last two tick
+    positions (see Simulation.mark_previous); returns an undo.
+    """
+    camera, rect = sim.camera, sim.player.rect
+    saved_camera = (camera.x, camera.y)
+    saved_center = rect.center
+
+    def lerp(a, b):
+        return round(a + (b - a) * alpha)
+
+    camera.x = lerp(sim.prev_camera[0], saved_camera[0])
+    camera.y = lerp(sim.prev_camera[1], saved_camera[1])
+    rect.center = (lerp(sim.prev_player[0], saved_center[0]),
+                   lerp(sim.prev_player[1], saved_center[1]))
+
+    # Sprite enemies in view and the orbs that moved
+    moved = []
+    centers = list(sim.prev_orbs.items())
+    if sim.enemy_backend != "array":
+        centers += [(e, e.prev_center) for e in sim.enemies.query_rect(view_rect(surface, sim))]
+    for sprite, (px, py) in centers:
+        cx, cy = sprite.rect.center
+        if (cx, cy) != (px, py) and abs(cx - px) <= MAX_LERP_STEP and abs(cy - py) <= MAX_LERP_STEP:
+            moved.append((sprite, (cx, cy)))
+            sprite.rect.center = (lerp(px, cx), lerp(py, cy))
+
+    # Array-backed enemies and projectiles
+    arrays = [sim.weapon_manager.projectiles]
+    if sim.enemy_backend == "array":
+        arrays.append(sim.enemies)
+    saved_arrays = [(owner, _lerp_arrays(owner, alpha)) for owner in arrays]
+
+    # Bullets the weapons keep themselves moved by exactly (dx, dy) this tick
+    bullets = [b for w in sim.weapon_manager.weapons for b in getattr(w, "bullets", ())
+               if isinstance(b, Bullet)]
+    saved_bullets = [(b.x, b.y) for b in bullets]
+    for b in bullets:
+        b.x -= b.dx * (1.0 - alpha)
+        b.y -= b.dy * (1.0 - alpha)
+
+    def restore():
+        camera.x, camera.y = saved_camera
+        rect.center = saved_center
+        for sprite, center in moved:
+            sprite.rect.center = center
+        for owner, (x, y) in saved_arrays:
+            owner.x, owner.y = x, y
+        for b, (x, y) in zip(bullets, saved_bullets):
+            b.x, b.y = x, y
+    return restore
@@ -0,0 +1,173 @@
+"""
+Input recordings: capture a run's per-tick input and replay it headless.
+
+A Simulation is fully determined by its seed, character/map settings and
+the TickInput of every step(), so that is all a recording stores. Inputs
+are packed into one byte per tick (TickInput.to_mask) and run-length
+encoded; a 20 minute run is a few KB.
+
+    VAMP_RECORD=run.vrec python main.py          # record games
+    python replay.py run.vrec                    # replay as fast as possible
+    python replay.py run.vrec --profile          # ... under cProfile
+    python replay.py run.vrec --phases           # ... with per-phase timings
+"""
+import argparse
+import json
+import struct
+import sys
+import time
+
+from game_manager import ENEMY_BUDGET
+from map import Map
+from simulation import Simulation, TickInput, NO_INPUT
+from utils import TICK_RATE
+
+
+MAGIC = b"VREC"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")     # magic, version, metadata length
+RUN = struct.Struct("<BH")          # input mask, tick count
+MAX_RUN = 0xFFFF
+
+
+# --------------------------------------------------------
+# RECORDING
+# --------------------------------------------------------
+class InputRecorder:
+    """Records every step() input of `sim` (attaches itself as sim.recorder)."""
+    def __init__(self, sim):
+        self.meta = {
+            "character": sim.character,
+            "seed": sim.seed,
+            "map_type": sim.map_type,
+            "map_seed": sim.map_seed,
+            "enemy_backend": sim.enemy_backend,
+            "endless": sim.endless,
+            "enemy_budget": sim.game_manager.director.budget,
+            "pathing": sim.flow_field is not None,
+            "tick_rate": TICK_RATE,
+        }
+        self.runs = []      # [mask, count]
+        self.ticks = 0
+        sim.recorder = self
+
+    def record(self, tick_input):
+        mask = tick_input.to_mask()
+        runs = self.runs
+        if runs and runs[-1][0] == mask and runs[-1][1] < MAX_RUN:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.ticks += 1
+
+    def save(self, path):
+        meta = json.dumps(dict(self.meta, ticks=self.ticks)).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(meta)))
+            f.write(meta)
+            f.write(b"".join(RUN.pack(mask, count) for mask, count in self.runs))
+
+
+def load_recording(path):
+    """Returns (meta dict, [(mask, count), ...])."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, meta_len = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a version {VERSION} input recording")
+    start = HEADER.size + meta_len
+    meta = json.loads(data[HEADER.size:start].decode("utf-8"))
+    runs = list(RUN.iter_unpack(data[start:]))
+    return meta, runs
+
+
+# --------------------------------------------------------
+# REPLAY
+# --------------------------------------------------------
+class ReplayPolicy:
+    """Feeds recorded runs back as TickInputs, then idles."""
+    def __init__(self, runs):
+        self.runs = runs
+        self.run_index = 0
+        self.left = runs[0][1] if runs else 0
+        self.current = TickInput.from_mask(runs[0][0]) if runs else NO_INPUT
+
+    def __call__(self, sim):
+        while self.left == 0:
+            self.run_index += 1
+            if self.run_index >= len(self.runs):
+                return NO_INPUT
+            mask, self.left = self.runs[self.run_index]
+            self.current = TickInput.from_mask(mask)
+        self.left -= 1
+        return self.current
+
+
+def replay_simulation(meta, runs):
+    """A Simulation set up like the recorded one, driven by its inputs."""
+    if meta.get("tick_rate", TICK_RATE) != TICK_RATE:
+        print(f"warning: recorded at {meta['tick_rate']} ticks/s, running at {TICK_RATE}",
+              file=sys.stderr)
+    # The exact map too: enemies path around its decorations, and passing
+    # only map_type would give it another layout seed (see build_map)
+    game_map = None
+    if "map_seed" in meta:
+        game_map = Map(map_type=meta["map_type"], seed=meta["map_seed"], endless=meta["endless"])
+    return Simulation(meta["character"], map_type=meta["map_type"], seed=meta["seed"],
+                      policy=ReplayPolicy(runs), enemy_backend=meta["enemy_backend"],
+                      endless=meta["endless"],
+                      enemy_budget=meta.get("enemy_budget", ENEMY_BUDGET),
+                      pathing=meta.get("pathing", True), game_map=game_map)
+
+
+# --------------------------------------------------------
+# CLI
+# --------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an input recording headless.")
+    parser.add_argument("recording")
+    parser.add_argument("--profile", action="store_true", help="run under cProfile")
+    parser.add_argument("--sort", default="cumulative", help="cProfile sort key")
+    parser.add_argument("--limit", type=int, default=30, help="cProfile rows to print")
+    parser.add_argument("--phases", action="store_true", help="time each update phase")
+    args = parser.parse_args(argv)
+
+    meta, runs = load_recording(args.recording)
+    sim = replay_simulation(meta, runs)
+    ticks = meta["ticks"]
+
+    timer = None
+    if args.phases:
+        from bench import PhaseTimer, summarize
+        timer = PhaseTimer("update.")
+
+    def run():
+        for _ in range(ticks):
+            sim.step(timer=timer)
+
+    start = time.perf_counter()
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.runcall(run)
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats(args.sort).print_stats(args.limit)
+    else:
+        run()
+    elapsed = time.perf_counter() - start
+
+    game_seconds = ticks / TICK_RATE
+    print(f"{ticks} ticks ({game_seconds:.0f}s of game) in {elapsed:.2f}s "
+          f"= {game_seconds / elapsed:.1f}x real time")
+    print(f"time {sim.game_manager.time:.1f}s  level {sim.player.level}  "
+          f"kills {sim.kills}  contact deaths {sim.contact_deaths}  xp {sim.player.xp_total}  "
+          f"game over {sim.game_over}")
+    if timer is not None:
+        for phase, samples in timer.samples.items():
+            s = summarize(samples)
+            print(f"  {phase:<22} mean {s['mean_ms']:.3f} ms  p95 {s['p95_ms']:.3f} ms  "
+                  f"max {s['max_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
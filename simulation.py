@@ -0,0 +1,438 @@
+import math
+import random
+
+import pygame
+
+from bullet import WORLD_BOUNDS
+from characters import CHARACTER_LIST
+from player import Player
+from map import Map
+from themes import registry as theme_registry
+from spatial_hash import SpatialGroup
+from utils import WORLD_WIDTH, WORLD_HEIGHT, TICK_RATE, Camera
+from weapon_manager import WeaponManager
+from flow_field import FlowField
+from game_manager import GameManager, ENEMY_BUDGET
+from renderer import Minimap
+from xp_orb import MAGNET_RADIUS, OrbMerger
+
+
+# Themes a random map is picked from (themes.json order)
+MAP_TYPES = theme_registry.rotation()
+
+
+def build_map(seed, map_type=None, endless=False):
+    """
+    The Map a Simulation with this run seed plays on (drawn from its "map"
+    stream), so it can be generated ahead of time and passed in.
+    """
+    map_rng = RngStreams(seed)["map"]
+    map_type = map_type or map_rng.choice(MAP_TYPES)
+    return Map(map_type=map_type, seed=map_rng.randint(0, 999999), endless=endless)
+
+
+# --------------------------------------------------------
+# RANDOM STREAMS
+# --------------------------------------------------------
+class RngStreams:
+    """
+    Independent random.Random streams per subsystem, all derived from one
+    run seed ("{seed}:{name}", like the map's chunk seeds). Subsystems
+    never share a stream, so drawing more numbers in one (say, a new
+    spawn rule) does not shift the others.
+    """
+    def __init__(self, seed):
+        self.seed = seed
+        self.streams = {}
+
+    def __getitem__(self, name):
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = self.streams[name] = random.Random(f"{self.seed}:{name}")
+        return rng
+
+
+# --------------------------------------------------------
+# FIXED TIMESTEP
+# --------------------------------------------------------
+MAX_CATCHUP = 5     # most ticks run for one rendered frame
+
+
+class FixedTimestep:
+    """
+    Accumulator for running the simulation at TICK_RATE regardless of
+    the frame rate. advance(frame_seconds) returns how many ticks to run
+    this frame; alpha is how far the next tick is (0..1), for drawing
+    positions between the last two ticks. Past `max_ticks` per frame the
+    backlog is dropped (the game slows down instead of spiralling).
+    """
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_CATCHUP):
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.dropped = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_seconds):
+        self.accumulator += frame_seconds
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_ticks:
+            self.dropped += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.dt
+        return ticks
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.dt, 1.0)
+
+
+# --------------------------------------------------------
+# INPUT FOR ONE TICK
+# --------------------------------------------------------
+class TickInput:
+    """
+    Everything the game reads from the player in a single tick.
+    The windowed game builds one from the keyboard/mouse, headless runs
+    get them from a policy (scripted list or bot).
+    """
+    __slots__ = ("up", "down", "left", "right", "escape", "upgrade")
+
+    # Bit layout of to_mask(): WASD, ESC, then the upgrade choice (0..3)
+    UP, DOWN, LEFT, RIGHT, ESCAPE = 1, 2, 4, 8, 16
+    UPGRADE_SHIFT = 5
+
+    def __init__(self, up=False, down=False, left=False, right=False,
+                 escape=False, upgrade=0):
+        self.up = up
+        self.down = down
+        self.left = left
+        self.right = right
+        self.escape = escape
+        self.upgrade = upgrade      # level-up choice 1..3, 0 = none
+
+    @classmethod
+    def from_keys(cls, keys, escape=False, upgrade=0):
+        """Build from pygame.key.get_pressed() (WASD movement)."""
+        return cls(bool(keys[pygame.K_w]), bool(keys[pygame.K_s]),
+                   bool(keys[pygame.K_a]), bool(keys[pygame.K_d]),
+                   escape, upgrade)
+
+    def to_mask(self):
+        """Pack into one byte (see the bit constants above)."""
+        return (self.up * self.UP | self.down * self.DOWN | self.left * self.LEFT
+                | self.right * self.RIGHT | self.escape * self.ESCAPE
+                | (self.upgrade & 3) << self.UPGRADE_SHIFT)
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls(bool(mask & cls.UP), bool(mask & cls.DOWN),
+                   bool(mask & cls.LEFT), bool(mask & cls.RIGHT),
+                   bool(mask & cls.ESCAPE), mask >> cls.UPGRADE_SHIFT & 3)
+
+    @property
+    def move(self):
+        return (self.right - self.left, self.down - self.up)
+
+
+NO_INPUT = TickInput()
+
+
+# --------------------------------------------------------
+# INPUT POLICIES
+# --------------------------------------------------------
+class ScriptedPolicy:
+    """Plays back a fixed list of TickInputs, then idles (or loops)."""
+    def __init__(self, inputs, loop=False):
+        self.inputs = list(inputs)
+        self.loop = loop
+        self.index = 0
+
+    def __call__(self, sim):
+        if self.index >= len(self.inputs):
+            if not self.loop or not self.inputs:
+                return NO_INPUT
+            self.index = 0
+        tick_input = self.inputs[self.index]
+        self.index += 1
+        return tick_input
+
+
+class BotPolicy:
+    """
+    Simple survival bot: runs away from nearby enemies, drifts back toward
+    the middle of the world when it is safe, and takes upgrades in turn.
+    """
+    def __init__(self, danger_radius=250, upgrades=(1, 2, 3)):
+        self.danger_radius = danger_radius
+        self.upgrades = upgrades
+        self.upgrade_index = 0
+
+    def __call__(self, sim):
+        player = sim.player
+        gm = sim.game_manager
+
+        # Level-up flow: open the menu, then pick the next upgrade
+        if gm.show_upgrade:
+            choice = self.upgrades[self.upgrade_index % len(self.upgrades)]
+            self.upgrade_index += 1
+            return TickInput(upgrade=choice)
+        if player.has_level_up_ready():
+            return TickInput(escape=True)
+
+        px, py = player.rect.center
+        fx = fy = 0.0
+        for e in sim.enemies.query_radius(px, py, self.danger_radius):
+            dx = px - e.rect.centerx
+            dy = py - e.rect.centery
+            d2 = dx * dx + dy * dy
+            if d2 > 0:
+                # closer enemies push harder
+                fx += dx / d2
+                fy += dy / d2
+
+        if fx == 0 and fy == 0:
+            fx = WORLD_WIDTH / 2 - px
+            fy = WORLD_HEIGHT / 2 - py
+            if math.hypot(fx, fy) < 100:
+                return NO_INPUT
+
+        return TickInput(up=fy < -abs(fx) * 0.4, down=fy > abs(fx) * 0.4,
+                         left=fx < -abs(fy) * 0.4, right=fx > abs(fy) * 0.4)
+
+
+# --------------------------------------------------------
+# SIMULATION
+# --------------------------------------------------------
+class Simulation:
+    """
+    One game session: player, weapons, game manager, enemy and orb groups,
+    camera and map. Advances one fixed tick per step() and never touches
+    the display, so it runs on machines without a video device.
+
+    enemy_backend: "sprites" (pygame Group of Enemy sprites) or "array"
+    (NumPy EnemyStore, for very large hordes).
+    endless: streaming, unbounded map instead of the fixed world.
+    enemy_budget: live enemies before spawns relocate far ones (SpawnDirector).
+    pathing: enemies route around decorations with a FlowField (else chase straight).
+    game_map: the Map from build_map(seed, map_type, endless), if already built.
+    """
+    def __init__(self, character="Warrior", map_type=None, seed=None, policy=None,
+                 enemy_backend="sprites", endless=False, enemy_budget=ENEMY_BUDGET,
+                 pathing=True, game_map=None):
+        # Every run has a seed (picked if not given) so it can be replayed.
+        # Subsystems draw from their own streams; the global random is
+        # seeded too for code outside them (weapons).
+        if seed is None:
+            seed = random.randrange(1 << 31)
+        random.seed(seed)
+        self.rng = RngStreams(seed)
+
+        self.character = character
+        self.seed = seed
+        self.policy = policy
+        self.endless = endless
+        self.recorder = None        # InputRecorder (replay.py), if recording
+        self.ticks = 0
+        # Enemies taken to 0 HP by the player's weapons, and enemies that
+        # died running into the player (same rule on both enemy backends)
+        self.kills = 0
+        self.contact_deaths = 0
+
+        char_data = CHARACTER_LIST[character]
+
+        # Player with character stats
+        self.player = Player(
+            WORLD_WIDTH // 2,
+            WORLD_HEIGHT // 2,
+            hp=char_data["hp"],
+            speed=char_data["speed"],
+            color=char_data["color"],
+        )
+        self.player.base_damage = char_data["damage"]
+        self.player.base_range = char_data["range"]
+        if endless:
+            self.player.bounds = None
+
+        # Weapon manager + starting weapon
+        self.weapon_manager = WeaponManager(self.player, bounds=None if endless else WORLD_BOUNDS)
+        self.weapon_manager.give_weapon(char_data["weapon"])
+
+        self.game_manager = GameManager(self.weapon_manager,
+                                        spawn_rng=self.rng["spawn"],
+                                        type_rng=self.rng["enemy_type"],
+                                        enemy_budget=enemy_budget)
+
+        # Other game systems
+        self.enemy_backend = enemy_backend
+        if enemy_backend == "array":
+            from enemy_store import EnemyStore
+            self.enemies = EnemyStore()
+        elif enemy_backend == "sprites":
+            self.enemies = SpatialGroup()
+        else:
+            raise ValueError(f"unknown enemy backend: {enemy_backend!r}")
+        self.xp_orbs = SpatialGroup()
+        self.orb_merger = OrbMerger()
+        self.camera = Camera(bounded=not endless)
+        # The run's density minimap; only the renderer draws (and so fills) it
+        self.minimap = Minimap()
+
+        self.camera.update(self.player.rect.centerx, self.player.rect.centery)
+
+        # Where everything was at the start of the tick, for interpolated drawing
+        self.mark_previous()
+
+        # Map
+        self.game_map = game_map or build_map(seed, map_type, endless)
+        self.map_type = self.game_map.map_type
+        self.map_seed = self.game_map.seed
+        self.flow_field = FlowField(self.game_map) if pathing else None
+
+        # Update phases in order; each takes no arguments
+        self.move = (0, 0)
+        self.phases = [
+            ("player", self.update_player),
+            ("weapons", self.update_weapons),
+            ("enemies", self.update_enemies),
+            ("orbs", self.update_orbs),
+            ("camera", self.update_camera),
+            ("game_manager", self.update_game_manager),
+        ]
+
+    # ------------------------------------------------------------
+    @property
+    def game_over(self):
+        return self.game_manager.game_over
+
+    @property
+    def paused(self):
+        return self.game_manager.show_upgrade or self.game_manager.game_over
+
+    # ------------------------------------------------------------
+    def handle_input(self, tick_input):
+        """ESC opens the level-up menu; upgrade picks an option from it."""
+        player = self.player
+        gm = self.game_manager
+
+        # ESC only opens menu when XP upgrade is ready
+        if tick_input.escape:
+            if player.has_level_up_ready() and not gm.show_upgrade and not gm.game_over:
+                gm.show_upgrade = True
+
+        if gm.show_upgrade and tick_input.upgrade:
+            gm.apply_upgrade(player, tick_input.upgrade)
+
+        self.move = tick_input.move
+
+    # ------------------------------------------------------------
+    def step(self, tick_input=None, timer=None):
+        """
+        Advance one tick.
+        tick_input: TickInput; defaults to the policy (or no input).
+        timer: optional callable timer(name, phase, *args) that runs
+        phase(*args), used by the benchmarks to time each phase separately.
+        Returns False once the game is over.
+        """
+        if tick_input is None:
+            tick_input = self.policy(self) if self.policy else NO_INPUT
+        if self.recorder is not None:
+            self.recorder.record(tick_input)
+
+        self.handle_input(tick_input)
+        self.mark_previous()
+
+        if self.paused:
+            return not self.game_over
+
+        if timer is None:
+            for _, phase in self.phases:
+                phase()
+        else:
+            for name, phase in self.phases:
+                timer(name, phase)
+
+        self.ticks += 1
+        return not self.game_over
+
+    def mark_previous(self):
+        """
+        Remember where the camera and the entities are before a tick, so
+        draw_game can place them between two ticks. Array backends copy
+        their positions, sprite enemies keep their own (Enemy.prev_center)
+        and the orbs update_orbs moves go in prev_orbs (orb -> center).
+        """
+        self.prev_camera = (self.camera.x, self.camera.y)
+        self.prev_player = self.player.rect.center
+        self.prev_orbs = {}
+        if self.enemy_backend == "array":
+            self.enemies.mark_previous()
+        self.weapon_manager.projectiles.mark_previous()
+
+    def close(self):
+        """Release background resources (the map's chunk worker) of a finished game."""
+        self.game_map.close()
+
+    def run(self, ticks):
+        """Step up to `ticks` times (stops at game over). Returns ticks run."""
+        start = self.ticks
+        for _ in range(ticks):
+            if not self.step():
+                break
+        return self.ticks - start
+
+    # ------------------------------------------------------------
+    # UPDATE PHASES
+    # ------------------------------------------------------------
+    def update_player(self):
+        self.player.update(self.move)
+
+    def update_weapons(self):
+        self.weapon_manager.update(self.enemies, self.xp_orbs)
+
+    def update_enemies(self):
+        field = self.flow_field
+        if field is not None:
+            field.update(*self.player.rect.center)
+
+        if self.enemy_backend == "array":
+            self.enemies.update(self.player, field)
+            kills, contact = self.enemies.handle_deaths(self.xp_orbs)
+            self.kills += kills
+            self.contact_deaths += contact
+            self.enemies.reindex()
+            return
+
+        for enemy in list(self.enemies):
+            # Weapons run first: HP already gone here is a kill, HP lost
+            # in update() is contact (Sprite.kill() removals are neither)
+            shot = enemy.health <= 0
+            enemy.update(self.player, field)
+            if enemy.handle_death(self.xp_orbs):
+                if shot:
+                    self.kills += 1
+                else:
+                    self.contact_deaths += 1
+        self.enemies.refresh_all()
+
+    def update_orbs(self):
+        # Orbs only move inside the magnet radius, so only those need updating
+        px, py = self.player.rect.center
+        index = self.xp_orbs.index
+        prev = self.prev_orbs
+        for orb in index.query_radius(px, py, MAGNET_RADIUS):
+            prev[orb] = orb.rect.center
+            orb.update(self.player, index)
+
+        # Keep the orb population bounded
+        self.orb_merger.update(self.xp_orbs, self.player)
+
+    def update_camera(self):
+        self.camera.update(self.player.rect.centerx, self.player.rect.centery)
+
+    def update_game_manager(self):
+        self.game_manager.update(self.player, self.enemies, self.xp_orbs, self.camera)
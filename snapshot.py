@@ -0,0 +1,383 @@
+"""
+Binary world-state snapshots: suspend/resume a run, or start benchmarks
+from a late-game state without simulating up to it.
+
+A snapshot is a small JSON header (scalars: player stats, timers, flags,
+seeds, weapons) followed by flat typed arrays (enemies, orbs, projectiles,
+RNG states), each 8-byte aligned. load_snapshot() memory-maps the file
+and copies the arrays straight into the new Simulation; the map is
+regenerated from its seed. Either enemy backend can load any snapshot.
+
+    python snapshot.py save late.vsnap --minutes 15 --seed 1   # bot run, then save
+    python snapshot.py info late.vsnap
+    python bench.py --snapshot late.vsnap -t 300               # benchmark from it
+"""
+import argparse
+import json
+import random
+import struct
+import time
+
+import numpy as np
+import pygame
+
+from enemy import ENEMY_TYPES
+from map import Map
+from pool import acquire
+from simulation import Simulation, BotPolicy
+from utils import TICK_RATE
+from xp_orb import XPOrb
+
+
+MAGIC = b"VSNP"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")     # magic, version, metadata length
+ALIGN = 8
+
+PLAYER_FIELDS = ("health", "max_health", "speed", "base_damage", "base_range", "level",
+                 "xp", "xp_required", "pending_upgrade", "xp_total")
+GAME_FIELDS = ("time", "spawn_timer", "show_upgrade", "game_over")
+# Simulation.rng streams saved (the global random is saved too)
+RNG_STREAMS = ("spawn", "enemy_type")
+
+
+# --------------------------------------------------------
+# CAPTURE
+# --------------------------------------------------------
+def _rng_state(rng):
+    """random.Random state as (uint32[625], gauss_next)."""
+    version, internal, gauss_next = rng.getstate()
+    return np.array(internal, dtype=np.uint32), gauss_next
+
+
+def _hash_order(group, sprites):
+    """
+    A SpatialGroup's index as (sprite number, x, y) in its iteration order:
+    query results come back in that order, so resume must rebuild it as is.
+    """
+    number = {id(s): i for i, s in enumerate(sprites)}
+    order = [(number[id(obj)], x, y) for cell in group.index.cells.values()
+             for obj, (x, y) in cell.items()]
+    cols = list(zip(*order)) if order else [(), (), ()]
+    return tuple(np.array(col, dtype=np.int32) for col in cols)
+
+
+def _restore_group(group, sprites, arrays, prefix):
+    entries = zip(arrays[prefix + "hash_order"].tolist(), arrays[prefix + "hash_x"].tolist(),
+                  arrays[prefix + "hash_y"].tolist())
+    group.restore(sprites, entries)
+
+
+def _enemy_arrays(sim):
+    enemies = sim.enemies
+    if sim.enemy_backend == "array":
+        n = enemies.count
+        type_names = [cls.__name__ for cls in enemies.types]
+        return type_names, {
+            "enemy.x": enemies.x[:n], "enemy.y": enemies.y[:n],
+            "enemy.health": enemies.health[:n], "enemy.max_health": enemies.max_health[:n],
+            "enemy.speed": enemies.speed[:n], "enemy.xp_reward": enemies.xp_reward[:n],
+            "enemy.type": enemies.type[:n], "enemy.killed": enemies.killed[:n],
+            # the broadphase as last indexed (spawns since are not in it yet)
+            "enemy.grid_x": enemies.grid.x, "enemy.grid_y": enemies.grid.y,
+        }
+
+    type_names = [cls.__name__ for cls in ENEMY_TYPES]
+    type_ids = {name: i for i, name in enumerate(type_names)}
+    sprites = enemies.sprites()
+    rows = [(e.rect.centerx, e.rect.centery, e.health, e.max_health, e.speed, e.xp_reward,
+             type_ids.setdefault(type(e).__name__, len(type_ids))) for e in sprites]
+    type_names = list(type_ids)
+    cols = list(zip(*rows)) if rows else [()] * 7
+    hash_order = _hash_order(enemies, sprites)
+    return type_names, {
+        "enemy.hash_order": hash_order[0],
+        "enemy.hash_x": hash_order[1],
+        "enemy.hash_y": hash_order[2],
+        "enemy.x": np.array(cols[0], dtype=np.float64),
+        "enemy.y": np.array(cols[1], dtype=np.float64),
+        "enemy.health": np.array(cols[2], dtype=np.float64),
+        "enemy.max_health": np.array(cols[3], dtype=np.float64),
+        "enemy.speed": np.array(cols[4], dtype=np.float64),
+        "enemy.xp_reward": np.array(cols[5], dtype=np.int32),
+        "enemy.type": np.array(cols[6], dtype=np.int16),
+        "enemy.killed": np.zeros(len(rows), dtype=bool),
+    }
+
+
+def capture(sim):
+    """(meta dict, {name: array}) for the full state of `sim`."""
+    player = sim.player
+    gm = sim.game_manager
+    wm = sim.weapon_manager
+
+    type_names, arrays = _enemy_arrays(sim)
+
+    # Orbs, plus the merger's pending queue as indices (-1: already gone)
+    orbs = sim.xp_orbs.sprites()
+    orb_index = {id(o): i for i, o in enumerate(orbs)}
+    arrays["orb.x"] = np.array([o.rect.x for o in orbs], dtype=np.int32)
+    arrays["orb.y"] = np.array([o.rect.y for o in orbs], dtype=np.int32)
+    arrays["orb.amount"] = np.array([o.amount for o in orbs], dtype=np.int32)
+    arrays["orb.merge_queue"] = np.array([orb_index.get(id(o), -1) for o in sim.orb_merger._queue],
+                                         dtype=np.int32)
+    arrays["orb.hash_order"], arrays["orb.hash_x"], arrays["orb.hash_y"] = _hash_order(
+        sim.xp_orbs, orbs)
+
+    projectiles = wm.projectiles
+    for name in projectiles.ARRAYS:
+        arrays["projectile." + name] = getattr(projectiles, name)[:projectiles.count]
+
+    gauss = {}
+    for name in RNG_STREAMS:
+        arrays["rng." + name], gauss[name] = _rng_state(sim.rng[name])
+    arrays["rng.global"], gauss["global"] = _rng_state(random)
+
+    meta = {
+        "character": sim.character,
+        "seed": sim.seed,
+        "map_type": sim.map_type,
+        "map_seed": sim.map_seed,
+        "endless": sim.endless,
+        "enemy_backend": sim.enemy_backend,
+        "enemy_budget": gm.director.budget,
+        "pathing": sim.flow_field is not None,
+        "flow_origin": sim.flow_field.origin if sim.flow_field is not None else None,
+        "tick_rate": TICK_RATE,
+        "ticks": sim.ticks,
+        "kills": sim.kills,
+        "contact_deaths": sim.contact_deaths,
+        "player": dict({name: getattr(player, name) for name in PLAYER_FIELDS},
+                       center=player.rect.center, color=list(player.color)),
+        "game": {name: getattr(gm, name) for name in GAME_FIELDS},
+        "director": {"spawned": gm.director.spawned, "recycled": gm.director.recycled},
+        "orb_merges": sim.orb_merger.merges,
+        "camera": [sim.camera.x, sim.camera.y],
+        "enemy_types": type_names,
+        # Weapon classes are external: keep their scalar state (cooldowns, levels)
+        "weapons": [{"name": name,
+                     "state": {k: v for k, v in vars(w).items()
+                               if isinstance(v, (bool, int, float, str))}}
+                    for name, w in zip(wm.weapon_names, wm.weapons)],
+        "projectile_stats": {"fired": projectiles.fired, "hits": projectiles.hits},
+        "rng_gauss": gauss,
+    }
+    return meta, arrays
+
+
+# --------------------------------------------------------
+# FILE FORMAT
+# --------------------------------------------------------
+def save_snapshot(sim, path):
+    """Write `sim` to `path`. Returns the file size in bytes."""
+    meta, arrays = capture(sim)
+
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        layout[name] = [arr.dtype.str, len(arr), offset]
+        offset += arr.nbytes
+    meta["arrays"] = layout
+
+    header = json.dumps(meta).encode("utf-8")
+    data_start = -(-(HEADER.size + len(header)) // ALIGN) * ALIGN
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + layout[name][2])
+            f.write(np.ascontiguousarray(arr).tobytes())
+        f.truncate(data_start + offset)
+    return data_start + offset
+
+
+def read_snapshot(path):
+    """(meta, {name: read-only array view}) with the arrays memory-mapped."""
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    magic, version, meta_len = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a version {VERSION} snapshot")
+    meta = json.loads(bytes(data[HEADER.size:HEADER.size + meta_len]).decode("utf-8"))
+    data_start = -(-(HEADER.size + meta_len) // ALIGN) * ALIGN
+
+    arrays = {name: np.frombuffer(data, dtype=np.dtype(dtype), count=count,
+                                  offset=data_start + offset)
+              for name, (dtype, count, offset) in meta["arrays"].items()}
+    return meta, arrays
+
+
+# --------------------------------------------------------
+# RESTORE
+# --------------------------------------------------------
+def _set_rng_state(rng, internal, gauss_next):
+    rng.setstate((3, tuple(internal.tolist()), gauss_next))
+
+
+def load_snapshot(path, policy=None, enemy_backend=None):
+    """
+    A Simulation in the saved state. enemy_backend overrides the saved one
+    (the same snapshot can feed either backend).
+    """
+    meta, arrays = read_snapshot(path)
+    backend = enemy_backend or meta["enemy_backend"]
+    game_map = Map(map_type=meta["map_type"], seed=meta["map_seed"], endless=meta["endless"])
+    sim = Simulation(meta["character"], seed=meta["seed"], policy=policy,
+                     enemy_backend=backend, endless=meta["endless"],
+                     enemy_budget=meta["enemy_budget"], pathing=meta["pathing"],
+                     game_map=game_map)
+    sim.ticks = meta["ticks"]
+    sim.kills = meta["kills"]
+    sim.contact_deaths = meta.get("contact_deaths", 0)
+
+    # Player
+    player = sim.player
+    for name, value in meta["player"].items():
+        if name in PLAYER_FIELDS:
+            setattr(player, name, value)
+    player.color = tuple(meta["player"]["color"])
+    player.rect.center = tuple(meta["player"]["center"])
+
+    # Timers / flags
+    gm = sim.game_manager
+    for name, value in meta["game"].items():
+        setattr(gm, name, value)
+    gm.director.spawned = meta["director"]["spawned"]
+    gm.director.recycled = meta["director"]["recycled"]
+    sim.camera.x, sim.camera.y = meta["camera"]
+
+    # Weapons: same list as saved, scalar state restored
+    wm = sim.weapon_manager
+    wm.weapons.clear()
+    wm.weapon_names.clear()
+    for weapon in meta["weapons"]:
+        wm.give_weapon(weapon["name"])
+        if wm.weapon_names and wm.weapon_names[-1] == weapon["name"]:
+            for key, value in weapon["state"].items():
+                setattr(wm.weapons[-1], key, value)
+
+    _load_enemies(sim, meta, arrays)
+    _load_orbs(sim, meta, arrays)
+    if sim.flow_field is not None and meta["flow_origin"] is not None:
+        sim.flow_field.update(*meta["flow_origin"])
+
+    projectiles = wm.projectiles
+    n = len(arrays["projectile.x"])
+    if n > projectiles.capacity:
+        projectiles._grow(n)
+    for name in projectiles.ARRAYS:
+        getattr(projectiles, name)[:n] = arrays["projectile." + name]
+    projectiles.count = n
+    projectiles.fired = meta["projectile_stats"]["fired"]
+    projectiles.hits = meta["projectile_stats"]["hits"]
+
+    gauss = meta["rng_gauss"]
+    for name in RNG_STREAMS:
+        _set_rng_state(sim.rng[name], arrays["rng." + name], gauss[name])
+    _set_rng_state(random, arrays["rng.global"], gauss["global"])
+    sim.mark_previous()
+    return sim
+
+
+def _load_enemies(sim, meta, arrays):
+    classes = {cls.__name__: cls for cls in ENEMY_TYPES}
+    types = [classes[name] for name in meta["enemy_types"]]
+    n = len(arrays["enemy.x"])
+    enemies = sim.enemies
+
+    if sim.enemy_backend == "array":
+        if n > enemies.capacity:
+            enemies._grow(n)
+        # saved type ids -> this store's type ids
+        remap = np.array([enemies._type_id(cls) for cls in types], dtype=np.int16)
+        enemies.x[:n] = arrays["enemy.x"]
+        enemies.y[:n] = arrays["enemy.y"]
+        enemies.health[:n] = arrays["enemy.health"]
+        enemies.max_health[:n] = arrays["enemy.max_health"]
+        enemies.speed[:n] = arrays["enemy.speed"]
+        enemies.xp_reward[:n] = arrays["enemy.xp_reward"]
+        enemies.type[:n] = remap[arrays["enemy.type"]] if n else 0
+        enemies.killed[:n] = arrays["enemy.killed"]
+        enemies.count = n
+        if "enemy.grid_x" in arrays:
+            enemies.grid.rebuild(arrays["enemy.grid_x"], arrays["enemy.grid_y"])
+        else:
+            enemies.reindex()
+        return
+
+    columns = zip(arrays["enemy.x"].tolist(), arrays["enemy.y"].tolist(),
+                  arrays["enemy.health"].tolist(), arrays["enemy.max_health"].tolist(),
+                  arrays["enemy.speed"].tolist(), arrays["enemy.xp_reward"].tolist(),
+                  arrays["enemy.type"].tolist(), arrays["enemy.killed"].tolist())
+    batch = []
+    for x, y, health, max_health, speed, xp_reward, type_id, killed in columns:
+        if killed:
+            continue
+        enemy = acquire(types[type_id], int(x), int(y))
+        enemy.health = health
+        enemy.max_health = max_health
+        enemy.speed = speed
+        enemy.xp_reward = xp_reward
+        batch.append(enemy)
+    if "enemy.hash_order" in arrays:
+        _restore_group(enemies, batch, arrays, "enemy.")
+    else:
+        enemies.add(*batch)
+
+
+def _load_orbs(sim, meta, arrays):
+    orbs = [acquire(XPOrb, x, y, amount) for x, y, amount in
+            zip(arrays["orb.x"].tolist(), arrays["orb.y"].tolist(), arrays["orb.amount"].tolist())]
+    _restore_group(sim.xp_orbs, orbs, arrays, "orb.")
+    # merged-away orbs still in the merger's queue: a dead placeholder keeps
+    # its batch budget the same as in the saved run
+    gone = pygame.sprite.Sprite()
+    sim.orb_merger._queue = [orbs[i] if i >= 0 else gone
+                             for i in arrays["orb.merge_queue"].tolist()]
+    sim.orb_merger.merges = meta["orb_merges"]
+
+
+# --------------------------------------------------------
+# CLI
+# --------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create or inspect world-state snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    save = sub.add_parser("save", help="run a seeded bot game, then snapshot it")
+    save.add_argument("path")
+    save.add_argument("--character", default="Warrior")
+    save.add_argument("--seed", type=int, default=1)
+    save.add_argument("--minutes", type=float, default=15.0)
+    save.add_argument("--enemy-backend", choices=["sprites", "array"], default="array")
+    save.add_argument("--immortal", action="store_true",
+                      help="keep the player alive so the state gets crowded")
+
+    info = sub.add_parser("info", help="summarize a snapshot")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "save":
+        sim = Simulation(args.character, seed=args.seed, policy=BotPolicy(),
+                         enemy_backend=args.enemy_backend)
+        if args.immortal:
+            sim.player.max_health = sim.player.health = 10 ** 9
+        sim.run(int(args.minutes * 60 * TICK_RATE))
+        start = time.perf_counter()
+        size = save_snapshot(sim, args.path)
+        print(f"{args.path}: {size / 1024:.0f} KB in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"({len(sim.enemies)} enemies, {len(sim.xp_orbs)} orbs, "
+              f"{sim.game_manager.time:.0f}s of game)")
+    else:
+        start = time.perf_counter()
+        meta, arrays = read_snapshot(args.path)
+        elapsed = time.perf_counter() - start
+        print(f"{meta['character']} seed {meta['seed']} on {meta['map_type']}, "
+              f"{meta['game']['time']:.0f}s, tick {meta['ticks']}, level {meta['player']['level']}")
+        for name, arr in arrays.items():
+            print(f"  {name:<22} {arr.dtype.str:<4} {len(arr):>7}")
+        print(f"read in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+import heapq
+import math
+
+import numpy as np
+import pygame
+
+
+CELL_SIZE = 64
+
+
+# --------------------------------------------
+# OBJECT GRID (incremental)
+# --------------------------------------------
+class SpatialHash:
+    """
+    Uniform grid over world coordinates.
+
+    Objects are bucketed by their (x, y) point and re-bucketed only when
+    move() puts them in a different cell, so keeping the index current
+    costs O(1) per moved object. Cells are stored sparsely by (col, row)
+    and dropped when empty, so the grid is unbounded (endless maps) and
+    its memory follows the entities, not the area they have covered.
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        # (col, row) -> {obj: (x, y)}
+        self.cells = {}
+        # obj -> (col, row)
+        self.where = {}
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, obj):
+        return obj in self.where
+
+    # ------------------------------------------------------------
+    # UPDATES
+    # ------------------------------------------------------------
+    def move(self, obj, x, y):
+        """Insert `obj` at (x, y), or update its position if present."""
+        cs = self.cell_size
+        key = (int(x // cs), int(y // cs))
+        old = self.where.get(obj)
+        if old != key:
+            if old is not None:
+                self._discard(old, obj)
+            self.where[obj] = key
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = {}
+            cell[obj] = (x, y)
+        else:
+            self.cells[key][obj] = (x, y)
+
+    insert = move
+
+    def _discard(self, key, obj):
+        cell = self.cells[key]
+        del cell[obj]
+        if not cell:
+            del self.cells[key]
+
+    def remove(self, obj):
+        key = self.where.pop(obj, None)
+        if key is not None:
+            self._discard(key, obj)
+
+    def clear(self):
+        self.cells.clear()
+        self.where.clear()
+
+    # ------------------------------------------------------------
+    # QUERIES
+    # ------------------------------------------------------------
+    def _cells_in(self, x0, y0, x1, y1):
+        cs = self.cell_size
+        c0, c1 = int(x0 // cs), int(x1 // cs)
+        r0, r1 = int(y0 // cs), int(y1 // cs)
+        cells = self.cells
+        if (c1 - c0 + 1) * (r1 - r0 + 1) > len(cells):
+            # query covers more cells than are occupied
+            for (col, row), cell in cells.items():
+                if c0 <= col <= c1 and r0 <= row <= r1:
+                    yield cell
+            return
+        for row in range(r0, r1 + 1):
+            for col in range(c0, c1 + 1):
+                cell = cells.get((col, row))
+                if cell:
+                    yield cell
+
+    def query_rect(self, rect):
+        """Objects whose point lies inside `rect` (a pygame.Rect or tuple)."""
+        left, top, w, h = rect
+        right, bottom = left + w, top + h
+        found = []
+        for cell in self._cells_in(left, top, right, bottom):
+            for obj, (x, y) in cell.items():
+                if left <= x < right and top <= y < bottom:
+                    found.append(obj)
+        return found
+
+    def query_radius(self, x, y, radius):
+        """Objects within `radius` of (x, y)."""
+        r2 = radius * radius
+        found = []
+        for cell in self._cells_in(x - radius, y - radius, x + radius, y + radius):
+            for obj, (ox, oy) in cell.items():
+                dx = ox - x
+                dy = oy - y
+                if dx * dx + dy * dy <= r2:
+                    found.append(obj)
+        return found
+
+    def nearest(self, x, y, k=1, max_radius=None):
+        """Up to `k` objects closest to (x, y), nearest first."""
+        if not self.where or k <= 0:
+            return []
+
+        cs = self.cell_size
+        cx, cy = int(x // cs), int(y // cs)
+        max_ring = None if max_radius is None else int(max_radius // cs) + 1
+        r2_limit = None if max_radius is None else max_radius * max_radius
+        total = len(self.where)
+
+        best = []      # (d2, scan order, obj): ties go to the first found, not id()
+        seen = 0
+        ring = 0
+        while max_ring is None or ring <= max_ring:
+            if (2 * ring + 1) ** 2 > 4 * len(self.cells):
+                # Rings now cost more than scanning every occupied cell
+                best = [((ox - x) ** 2 + (oy - y) ** 2, n, obj)
+                        for n, (obj, (ox, oy)) in enumerate(
+                            item for cell in self.cells.values() for item in cell.items())]
+                if r2_limit is not None:
+                    best = [b for b in best if b[0] <= r2_limit]
+                break
+
+            for key in self._ring(cx, cy, ring):
+                cell = self.cells.get(key)
+                if not cell:
+                    continue
+                seen += len(cell)
+                for obj, (ox, oy) in cell.items():
+                    d2 = (ox - x) ** 2 + (oy - y) ** 2
+                    if r2_limit is None or d2 <= r2_limit:
+                        best.append((d2, len(best), obj))
+
+            if seen >= total:
+                break
+            # Anything in a later ring is at least ring * cell_size away
+            if len(best) >= k:
+                reach = ring * cs
+                if heapq.nsmallest(k, best)[-1][0] <= reach * reach:
+                    break
+            ring += 1
+
+        return [obj for _, _, obj in heapq.nsmallest(k, best)]
+
+    @staticmethod
+    def _ring(cx, cy, ring):
+        """Cells at Chebyshev distance `ring` from (cx, cy)."""
+        if ring == 0:
+            yield cx, cy
+            return
+        for col in range(cx - ring, cx + ring + 1):
+            yield col, cy - ring
+            yield col, cy + ring
+        for row in range(cy - ring + 1, cy + ring):
+            yield cx - ring, row
+            yield cx + ring, row
+
+
+# --------------------------------------------
+# SPRITE GROUP WITH A BUILT-IN INDEX
+# --------------------------------------------
+class SpatialGroup(pygame.sprite.Group):
+    """
+    pygame Group that keeps a SpatialHash of its sprites' rect centers.
+    add()/kill()/remove() update the index automatically; call
+    refresh(sprite) after a sprite moves, or refresh_all() after moving
+    many of them.
+    """
+    def __init__(self, *sprites, cell_size=CELL_SIZE):
+        self.index = SpatialHash(cell_size)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.index.move(sprite, *sprite.rect.center)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.index.remove(sprite)
+
+    def refresh(self, sprite):
+        self.index.move(sprite, *sprite.rect.center)
+
+    def restore(self, sprites, entries):
+        """
+        Bulk add for snapshot restore. `sprites` join in group order;
+        `entries` are (sprite number, x, y) in a saved index's iteration
+        order, so queries come back in the same order as before the save.
+        """
+        group_add = pygame.sprite.AbstractGroup.add_internal
+        for sprite in sprites:
+            group_add(self, sprite)
+            sprite.add_internal(self)
+
+        index = self.index
+        cells = index.cells
+        where = index.where
+        cs = index.cell_size
+        for i, x, y in entries:
+            sprite = sprites[i]
+            key = (x // cs, y // cs)
+            where[sprite] = key
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = {}
+            cell[sprite] = (x, y)
+
+    def refresh_all(self):
+        """Re-sync every sprite after a bulk move (one tight loop)."""
+        index = self.index
+        cells = index.cells
+        where = index.where
+        cs = index.cell_size
+        for sprite in self.spritedict:
+            x, y = sprite.rect.center
+            key = (x // cs, y // cs)
+            old = where[sprite]
+            if old != key:
+                index._discard(old, sprite)
+                where[sprite] = key
+                cell = cells.get(key)
+                if cell is None:
+                    cell = cells[key] = {}
+                cell[sprite] = (x, y)
+            else:
+                cells[key][sprite] = (x, y)
+
+    # Same query API as EnemyStore
+    def query_rect(self, rect):
+        return self.index.query_rect(rect)
+
+    def query_radius(self, x, y, radius):
+        return self.index.query_radius(x, y, radius)
+
+    def nearest(self, x, y, k=1, max_radius=None):
+        return self.index.nearest(x, y, k, max_radius)
+
+
+# --------------------------------------------
+# POINT GRID (bulk rebuilt, NumPy)
+# --------------------------------------------
+class PointGrid:
+    """
+    Same uniform grid for NumPy point arrays (EnemyStore, projectiles).
+    rebuild() bins every point in one vectorized pass (counting sort by
+    cell); queries return integer indices into the arrays it was built from.
+    The grid spans the points' bounding box at rebuild time (so it works on
+    endless maps); at most `max_cells` cells, outliers share edge cells.
+    """
+    def __init__(self, cell_size=CELL_SIZE, max_cells=1 << 16):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self.col0 = self.row0 = 0
+        self.cols = self.rows = 1
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.order = np.zeros(0, dtype=np.intp)
+        self.starts = np.zeros(2, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.x)
+
+    def rebuild(self, x, y):
+        """Bin points (x[i], y[i]). Copies the coordinates."""
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        cs = self.cell_size
+        col = (self.x // cs).astype(np.intp)
+        row = (self.y // cs).astype(np.intp)
+
+        if len(col):
+            self.col0, self.row0 = int(col.min()), int(row.min())
+            self.cols = int(col.max()) - self.col0 + 1
+            self.rows = int(row.max()) - self.row0 + 1
+            # very spread out: keep the cells around the median
+            if self.cols * self.rows > self.max_cells:
+                side = int(math.isqrt(self.max_cells))
+                self.cols = min(self.cols, side)
+                self.rows = min(self.rows, side)
+                self.col0 = int(np.median(col)) - self.cols // 2
+                self.row0 = int(np.median(row)) - self.rows // 2
+        else:
+            self.col0 = self.row0 = 0
+            self.cols = self.rows = 1
+
+        col = np.clip(col - self.col0, 0, self.cols - 1)
+        row = np.clip(row - self.row0, 0, self.rows - 1)
+        cell = row * self.cols + col
+        self.order = np.argsort(cell, kind="stable")
+        counts = np.bincount(cell, minlength=self.cols * self.rows)
+        self.starts = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=self.starts[1:])
+
+    def _candidates(self, x0, y0, x1, y1):
+        cs = self.cell_size
+        c0 = min(max(int(x0 // cs) - self.col0, 0), self.cols - 1)
+        c1 = min(max(int(x1 // cs) - self.col0, 0), self.cols - 1)
+        r0 = min(max(int(y0 // cs) - self.row0, 0), self.rows - 1)
+        r1 = min(max(int(y1 // cs) - self.row0, 0), self.rows - 1)
+        # each grid row is one contiguous run of the sorted order
+        parts = [self.order[self.starts[r * self.cols + c0]:self.starts[r * self.cols + c1 + 1]]
+                 for r in range(r0, r1 + 1)]
+        if not parts:
+            return self.order[:0]
+        return np.concatenate(parts)
+
+    def pairs_in_rects(self, x0, y0, x1, y1):
+        """
+        Batched query_rect for many small boxes (x0[i], y0[i])..(x1[i], y1[i]).
+        Returns (query, point) index arrays, one entry per point inside a
+        box, gathered in one vectorized pass instead of a call per box.
+        """
+        empty = np.zeros(0, dtype=np.intp)
+        if len(x0) == 0 or len(self.x) == 0:
+            return empty, empty
+        cs = self.cell_size
+        c0 = np.clip((x0 // cs).astype(np.intp) - self.col0, 0, self.cols - 1)
+        c1 = np.clip((x1 // cs).astype(np.intp) - self.col0, 0, self.cols - 1)
+        r0 = np.clip((y0 // cs).astype(np.intp) - self.row0, 0, self.rows - 1)
+        r1 = np.clip((y1 // cs).astype(np.intp) - self.row0, 0, self.rows - 1)
+
+        # each grid row of a box is one contiguous run of the sorted order
+        queries, first, last = [], [], []
+        for dr in range(int((r1 - r0).max()) + 1):
+            q = np.flatnonzero(r0 + dr <= r1)
+            row = (r0[q] + dr) * self.cols
+            queries.append(q)
+            first.append(self.starts[row + c0[q]])
+            last.append(self.starts[row + c1[q] + 1])
+        q = np.concatenate(queries)
+        first = np.concatenate(first)
+        lengths = np.concatenate(last) - first
+
+        total = int(lengths.sum())
+        ends = np.cumsum(lengths)
+        query = np.repeat(q, lengths)
+        point = self.order[np.repeat(first - (ends - lengths), lengths) + np.arange(total)]
+
+        x = self.x[point]
+        y = self.y[point]
+        inside = (x >= x0[query]) & (x < x1[query]) & (y >= y0[query]) & (y < y1[query])
+        return query[inside], point[inside]
+
+    def query_rect(self, rect):
+        left, top, w, h = rect
+        idx = self._candidates(left, top, left + w, top + h)
+        x = self.x[idx]
+        y = self.y[idx]
+        return idx[(x >= left) & (x < left + w) & (y >= top) & (y < top + h)]
+
+    def query_radius(self, x, y, radius):
+        idx = self._candidates(x - radius, y - radius, x + radius, y + radius)
+        dx = self.x[idx] - x
+        dy = self.y[idx] - y
+        return idx[dx * dx + dy * dy <= radius * radius]
+
+    def nearest(self, x, y, k=1, max_radius=None):
+        """Indices of up to `k` nearest points, nearest first."""
+        n = len(self.x)
+        if n == 0 or k <= 0:
+            return self.order[:0]
+        radius = self.cell_size
+        limit = max_radius if max_radius is not None else math.hypot(
+            (self.cols + 1) * self.cell_size, (self.rows + 1) * self.cell_size)
+        while True:
+            radius = min(radius, limit)
+            idx = self.query_radius(x, y, radius)
+            if len(idx) >= k or radius >= limit:
+                break
+            radius *= 2
+        if len(idx) < k and max_radius is None:
+            # outliers clipped into edge cells
+            idx = np.arange(n)
+        d2 = (self.x[idx] - x) ** 2 + (self.y[idx] - y) ** 2
+        return idx[np.argsort(d2, kind="stable")[:k]]
@@ -0,0 +1,63 @@
+import pygame
+
+
+# --------------------------------------------
+# PRE-RENDERED SPRITES
+# --------------------------------------------
+# Entities draw by blitting shared, pre-rendered surfaces; whole
+# populations go out in one Surface.blits() call instead of several
+# pygame.draw calls per entity.
+
+HP_BAR_W = 20
+HP_BAR_H = 4
+HP_BAR_STEPS = HP_BAR_W     # one overlay per pixel of fill, so nothing is lost
+
+# Shapes are drawn without antialiasing, so a colorkey with RLE is exact
+# and blits several times faster than per-pixel alpha.
+COLORKEY = (255, 0, 255)
+
+_circles = {}
+_hp_bars = []
+
+
+def _prepare(surface, colorkey=None):
+    """Match the display format once one exists (faster blits)."""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    if colorkey is not None:
+        surface.set_colorkey(colorkey, pygame.RLEACCEL)
+    return surface
+
+
+def circle_sprite(color, radius):
+    """Filled circle; blit at (cx - radius, cy - radius)."""
+    key = (tuple(color), radius)
+    sprite = _circles.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2))
+        sprite.fill(COLORKEY)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        sprite = _circles[key] = _prepare(sprite, COLORKEY)
+    return sprite
+
+
+def hp_bar_step(ratio):
+    """Quantized fill level 0..HP_BAR_STEPS for an HP ratio."""
+    return min(max(int(ratio * HP_BAR_STEPS), 0), HP_BAR_STEPS)
+
+
+def hp_bars():
+    """HP bar overlays indexed by hp_bar_step()."""
+    if not _hp_bars:
+        for step in range(HP_BAR_STEPS + 1):
+            bar = pygame.Surface((HP_BAR_W, HP_BAR_H))
+            bar.fill((150, 0, 0))
+            fill = HP_BAR_W * step // HP_BAR_STEPS
+            if fill:
+                bar.fill((0, 200, 0), (0, 0, fill, HP_BAR_H))
+            _hp_bars.append(_prepare(bar))
+    return _hp_bars
+
+
+def hp_bar(ratio):
+    return hp_bars()[hp_bar_step(ratio)]
@@ -0,0 +1,128 @@
+"""
+Cold-start helpers for main.py.
+
+The character-select screen only needs the display and a font, so it is
+put up first; everything else is deferred:
+  * audio is opened on a background thread (nothing waits for it),
+  * GameLoader imports the game modules, generates the next game's map and
+    pre-bakes the chunks around the spawn point while the menu is shown,
+  * StartupTimer reports import, init and first-frame times.
+
+    VAMP_STARTUP=1 python main.py       # full per-step startup report
+"""
+import importlib
+import os
+import random
+import threading
+import time
+
+import pygame
+
+from utils import WIDTH, HEIGHT, WORLD_WIDTH, WORLD_HEIGHT, Camera
+
+
+# Imported by GameLoader, off the path to the first menu frame
+GAME_MODULES = ("simulation", "renderer", "profiler", "replay")
+
+# --------------------------------------------
+# STARTUP REPORT
+# --------------------------------------------
+class StartupTimer:
+    """
+    Named steps since `start` (a perf_counter() taken first thing in main.py).
+    Steps marked idle (waiting on the player) are listed but not counted.
+    """
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.steps = []     # (name, seconds, idle)
+        self.reported = False
+
+    def mark(self, name, idle=False):
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last, idle))
+        self.last = now
+
+    def total(self):
+        return sum(seconds for _, seconds, idle in self.steps if not idle)
+
+    def report(self):
+        steps = ", ".join(f"[{name} {seconds:.1f} s]" if idle else f"{name} {seconds * 1000:.0f} ms"
+                          for name, seconds, idle in self.steps)
+        return f"Startup: {steps} (total {self.total() * 1000:.0f} ms)"
+
+    def print_once(self):
+        """Print the summary line (or every step with VAMP_STARTUP set) once."""
+        if self.reported:
+            return
+        self.reported = True
+        if os.environ.get("VAMP_STARTUP"):
+            for name, seconds, idle in self.steps:
+                print(f"  {name:<18} {seconds * 1000:9.1f} ms{'  (idle)' if idle else ''}")
+        print(self.report())
+
+
+# --------------------------------------------
+# DEFERRED INIT
+# --------------------------------------------
+def init_audio_async():
+    """Open the audio device on a background thread; a missing device is ignored."""
+    def run():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            pass
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+class GameLoader:
+    """
+    Prepares the next game on a background thread: imports the simulation
+    modules, builds the map for `seed` (see simulation.build_map) and
+    queues the chunks around the spawn point for pre-baking.
+    result() waits for it and returns the Map; whoever ends up owning it
+    (the Simulation) must close() it, which stops the chunk worker.
+    close() discards a loader whose map is never used.
+    """
+    def __init__(self, seed=None, endless=False):
+        self.seed = random.randrange(1 << 31) if seed is None else seed
+        self.endless = endless
+        self.game_map = None
+        self.error = None
+        self.seconds = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            for name in GAME_MODULES:
+                importlib.import_module(name)
+            from simulation import build_map
+            game_map = build_map(self.seed, endless=self.endless)
+
+            # The player spawns in the middle of the world
+            camera = Camera(bounded=not self.endless)
+            camera.update(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
+            game_map.chunks.prefetch(game_map.chunks.visible(camera.x, camera.y, WIDTH, HEIGHT))
+            self.game_map = game_map
+        except Exception as exc:    # re-raised on the main thread by result()
+            self.error = exc
+        self.seconds = time.perf_counter() - start
+
+    def ready(self):
+        return not self._thread.is_alive()
+
+    def result(self):
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.game_map
+
+    def close(self):
+        self._thread.join()
+        if self.game_map is not None:
+            self.game_map.close()
+            self.game_map = None
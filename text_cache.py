@@ -0,0 +1,61 @@
+import pygame
+from collections import OrderedDict
+
+
+# --------------------------------------------
+# FONT REGISTRY
+# --------------------------------------------
+_fonts = {}
+
+
+def get_font(size, name=None):
+    """Shared pygame Font for (name, size); name=None is the default font."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+
+# --------------------------------------------
+# RENDERED TEXT CACHE
+# --------------------------------------------
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, size, text, color).
+    HUD strings like "LVL 3" or "Time: 42s" only change now and then, so
+    each distinct string is rasterized once and reused until it falls out.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, name=None):
+        key = (name, size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = get_font(size, name).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(text, size, color, name=None):
+    """Render `text` through the shared cache (antialiased)."""
+    return text_cache.render(text, size, color, name)
@@ -0,0 +1,109 @@
+"""
+Map themes: ground colors, decoration mix and density, read from data files.
+
+themes.json holds the built-in themes. More come from
+  * register() / register_file() at runtime,
+  * a JSON file with the same layout named by VAMP_THEMES.
+A later definition replaces an earlier one of the same name.
+
+    {"decorations": {"tree": {"color": [r, g, b], "radius": 20, "trunk": [r, g, b]}},
+     "themes": {"forest": {"base_color": [r, g, b], "alt_color": [r, g, b],
+                           "tile_size": 80,
+                           "decorations": ["tree", "tree", "rock"],
+                           "decoration_count": 140,
+                           "random": true}}}
+
+"decorations" is the mix decorations are drawn from (uniformly, so repeat
+a name to make it more common), "decoration_count" the number over the
+fixed world (endless maps keep the same density) and "random": false
+leaves a theme out of the random map rotation.
+
+    python themes.py        # list the themes
+"""
+import json
+import os
+
+
+THEME_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes.json")
+DEFAULT_THEME = "default"
+
+
+class DecorationKind:
+    """How one decoration type is drawn: a filled circle, optionally on a trunk."""
+    def __init__(self, name, color, radius, trunk=None):
+        self.name = name
+        self.color = tuple(color)
+        self.radius = radius
+        self.trunk_color = tuple(trunk) if trunk is not None else None
+
+
+# Decoration types no data file defines
+UNKNOWN_DECORATION = DecorationKind("unknown", (255, 255, 255), 10)
+
+
+class Theme:
+    """
+    One map theme. Immutable once registered: redefining a name registers
+    a new Theme, so anything keyed on a Theme (baked map chunks) never
+    outlives its definition.
+    """
+    def __init__(self, name, base_color, alt_color, decorations, decoration_count,
+                 tile_size=80, random=True):
+        self.name = name
+        self.base_color = tuple(base_color)
+        self.alt_color = tuple(alt_color)
+        self.decoration_types = list(decorations)
+        self.decoration_count = decoration_count
+        self.tile_size = tile_size
+        self.random = random
+
+
+class ThemeRegistry:
+    """Theme and decoration definitions by name."""
+    def __init__(self):
+        self.themes = {}            # name -> Theme, in definition order
+        self.decorations = {}       # name -> DecorationKind
+
+    # ------------------------------------------------------------
+    # REGISTRATION
+    # ------------------------------------------------------------
+    def register(self, data):
+        """Add the "decorations" and "themes" of one parsed data file."""
+        for name, spec in data.get("decorations", {}).items():
+            self.decorations[name] = DecorationKind(name, **spec)
+        for name, spec in data.get("themes", {}).items():
+            self.themes.pop(name, None)
+            self.themes[name] = Theme(name, **spec)
+
+    def register_file(self, path):
+        with open(path) as f:
+            self.register(json.load(f))
+
+    # ------------------------------------------------------------
+    # LOOKUP
+    # ------------------------------------------------------------
+    def theme(self, name):
+        """The Theme called `name`; unknown names get the default theme."""
+        theme = self.themes.get(name)
+        return theme if theme is not None else self.themes[DEFAULT_THEME]
+
+    def decoration(self, name):
+        kind = self.decorations.get(name)
+        return kind if kind is not None else UNKNOWN_DECORATION
+
+    def rotation(self):
+        """Theme names a random map is picked from, in definition order."""
+        return [name for name, theme in self.themes.items() if theme.random]
+
+
+registry = ThemeRegistry()
+registry.register_file(THEME_FILE)
+if os.environ.get("VAMP_THEMES"):
+    registry.register_file(os.environ["VAMP_THEMES"])
+
+
+if __name__ == "__main__":
+    for theme_name, theme_def in registry.themes.items():
+        mix = ", ".join(theme_def.decoration_types)
+        rotation = "" if theme_def.random else "  (not in rotation)"
+        print(f"{theme_name:<12} {theme_def.decoration_count:4d} x [{mix}]{rotation}")
@@ -0,0 +1,54 @@
+import pygame
+
+
+_NEVER = object()   # key that never matches, forces the first render
+
+
+class Layer:
+    """
+    A cached piece of UI drawn into its own surface.
+
+    render(surface, key) paints the layer in local coordinates; it only
+    runs again when the `key` passed to draw() changes (level, XP, time
+    second, hovered button...), otherwise draw() is a single blit.
+
+    transparent: per-pixel alpha surface (text, panels), else opaque.
+    alpha: whole-surface alpha for screen overlays (dim / tint).
+    """
+    def __init__(self, rect, render, transparent=True, alpha=None):
+        self.rect = pygame.Rect(rect)
+        self.render = render
+        self.transparent = transparent
+        self.alpha = alpha
+        self.surface = None
+        self.key = _NEVER
+        self.renders = 0
+
+    def invalidate(self):
+        self.key = _NEVER
+
+    def draw(self, target, key=None):
+        if key != self.key:
+            self._rebuild(key)
+        target.blit(self.surface, self.rect.topleft)
+
+    def _rebuild(self, key):
+        if self.surface is None:
+            if self.transparent:
+                self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            else:
+                self.surface = pygame.Surface(self.rect.size)
+            if self.alpha is not None:
+                self.surface.set_alpha(self.alpha)
+        elif self.transparent:
+            self.surface.fill((0, 0, 0, 0))
+
+        self.render(self.surface, key)
+        self.key = key
+        self.renders += 1
+
+
+def overlay_layer(size, color, alpha):
+    """Full-screen tint: filled once, blitted with surface alpha."""
+    return Layer((0, 0) + tuple(size), lambda surface, key: surface.fill(color),
+                 transparent=False, alpha=alpha)
@@ -10,16 +10,31 @@ HEIGHT = 720
 WORLD_WIDTH = 3000
 WORLD_HEIGHT = 2000
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# Simulation ticks per second of game time. Speeds are per tick and the
+# game loop runs a fixed number of ticks per second (see FixedTimestep).
+TICK_RATE = 60
+
+# The window is opened on demand so headless code (Simulation, benchmarks,
+# CI soak tests) can import this module without a video device.
+screen = None
+
+
+def init_display():
+    """Open the game window once and return the screen surface."""
+    global screen
+    if screen is None:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    return screen
 
 
 # --------------------------------------------
 # CAMERA
 # --------------------------------------------
 class Camera:
-    def __init__(self):
+    def __init__(self, bounded=True):
         self.x = 0
         self.y = 0
+        self.bounded = bounded  # False on endless maps
 
     def update(self, target_x, target_y):
         # Center camera on target
@@ -27,8 +42,9 @@ class Camera:
         self.y = target_y - HEIGHT // 2
 
         # Clamp to world bounds
-        self.x = max(0, min(self.x, WORLD_WIDTH - WIDTH))
-        self.y = max(0, min(self.y, WORLD_HEIGHT - HEIGHT))
+        if self.bounded:
+            self.x = max(0, min(self.x, WORLD_WIDTH - WIDTH))
+            self.y = max(0, min(self.y, WORLD_HEIGHT - HEIGHT))
 
 
 # --------------------------------------------
@@ -37,30 +53,33 @@ class Camera:
 
 SPAWN_MARGIN = 180  # distance OUTSIDE the screen enemies appear
 
-def get_spawn_position(camera):
-    """Spawn enemies OUTSIDE the player's camera view (true off-screen)."""
+def get_spawn_position(camera, rng=random):
+    """
+    Spawn enemies OUTSIDE the player's camera view (true off-screen).
+    rng: random.Random stream to draw from (default: the global one).
+    """
 
     left = camera.x
     right = camera.x + WIDTH
     top = camera.y
     bottom = camera.y + HEIGHT
 
-    side = random.randint(0, 3)
+    side = rng.randint(0, 3)
 
     if side == 0:  # left
         x = left - SPAWN_MARGIN
-        y = random.randint(top - SPAWN_MARGIN, bottom + SPAWN_MARGIN)
+        y = rng.randint(top - SPAWN_MARGIN, bottom + SPAWN_MARGIN)
 
     elif side == 1:  # right
         x = right + SPAWN_MARGIN
-        y = random.randint(top - SPAWN_MARGIN, bottom + SPAWN_MARGIN)
+        y = rng.randint(top - SPAWN_MARGIN, bottom + SPAWN_MARGIN)
 
     elif side == 2:  # top
-        x = random.randint(left - SPAWN_MARGIN, right + SPAWN_MARGIN)
+        x = rng.randint(left - SPAWN_MARGIN, right + SPAWN_MARGIN)
         y = top - SPAWN_MARGIN
 
     else:  # bottom
-        x = random.randint(left - SPAWN_MARGIN, right + SPAWN_MARGIN)
+        x = rng.randint(left - SPAWN_MARGIN, right + SPAWN_MARGIN)
         y = bottom + SPAWN_MARGIN
 
     return x, y
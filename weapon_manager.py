@@ -1,40 +1,91 @@
-# weapon_manager.py  (inside /Weapon directory)
+# weapon_manager.py  (weapon classes come from weapon_registry.py)
 
-from Weapon.axe import Axe
-from Weapon.shuriken import Shuriken
-from Weapon.burst import Burst
-from Weapon.fireball import Fireball
-from Weapon.gun import Gun
+import pygame
 
-
-WEAPON_TYPES = {
-    "axe": Axe,
-    "shuriken": Shuriken,
-    "burst": Burst,
-    "fireball": Fireball,
-    "gun": Gun,
-}
+from bullet import Bullet, WORLD_BOUNDS
+from projectiles import ProjectileSystem
+from weapon_registry import registry
 
 
 class WeaponManager:
-    def __init__(self, player):
+    def __init__(self, player, bounds=WORLD_BOUNDS):
         self.player = player
+        # (left, top, right, bottom) shots are dropped outside of; None = endless
+        self.bounds = bounds
         self.weapons = []
+        self.weapon_names = []      # registry name of each entry in weapons
+        # Enemy population from the last update(); a SpatialGroup or
+        # EnemyStore exposes a broadphase, a plain Group is scanned
+        self.enemies = None
+
+        # Shared projectiles, moved and hit-tested in one batch per tick.
+        # Weapons only get the player, so the ones that opt in fire through
+        # player.projectiles (see projectiles.py); the rest keep their Bullets.
+        self.projectiles = ProjectileSystem(bounds=bounds)
+        player.projectiles = self.projectiles
 
     def give_weapon(self, weapon_name):
-        if weapon_name not in WEAPON_TYPES:
+        # Weapon modules are imported on first use; `python weapon_registry.py`
+        # reports what each import costs
+        try:
+            weapon_class = registry.resolve(weapon_name)
+        except KeyError:
             print(f"[WeaponManager] ERROR: Weapon '{weapon_name}' not found.")
             return
 
-        weapon = WEAPON_TYPES[weapon_name](self.player)
+        weapon = weapon_class(self.player)
         self.weapons.append(weapon)
+        self.weapon_names.append(weapon_name)
 
         print("[WeaponManager] Equipped:", weapon_name)
 
     def update(self, enemies, xp_group):
-        for w in self.weapons:
-            w.update(enemies, xp_group)
+        self.enemies = enemies
+        # Weapons create their own Bullets, which check the class-wide bounds
+        outer_bounds = Bullet.world_bounds
+        Bullet.world_bounds = self.bounds
+        try:
+            for w in self.weapons:
+                w.update(enemies, xp_group)
+        finally:
+            Bullet.world_bounds = outer_bounds
+        self.projectiles.update(enemies)
+
+    # ------------------------------------------------------------
+    # TARGETING (broadphase queries for weapons)
+    # ------------------------------------------------------------
+    def enemies_in_radius(self, x, y, radius):
+        if self.enemies is None:
+            return []
+        if hasattr(self.enemies, "query_radius"):
+            return self.enemies.query_radius(x, y, radius)
+        r2 = radius * radius
+        return [e for e in self.enemies
+                if (e.rect.centerx - x) ** 2 + (e.rect.centery - y) ** 2 <= r2]
+
+    def enemies_in_rect(self, rect):
+        if self.enemies is None:
+            return []
+        if hasattr(self.enemies, "query_rect"):
+            return self.enemies.query_rect(rect)
+        rect = pygame.Rect(rect)
+        return [e for e in self.enemies if rect.collidepoint(e.rect.center)]
+
+    def nearest_enemies(self, x, y, k=1, max_radius=None):
+        if self.enemies is None:
+            return []
+        if hasattr(self.enemies, "nearest"):
+            return self.enemies.nearest(x, y, k, max_radius)
+        found = self.enemies_in_radius(x, y, max_radius) if max_radius is not None else list(self.enemies)
+        found.sort(key=lambda e: (e.rect.centerx - x) ** 2 + (e.rect.centery - y) ** 2)
+        return found[:k]
+
+    def nearest_enemy(self, x, y, max_radius=None):
+        found = self.nearest_enemies(x, y, 1, max_radius)
+        return found[0] if found else None
 
-    def draw(self, surface, ox, oy):
+    def draw(self, surface, ox, oy, view=None):
+        """Draw weapons, then projectiles. Returns projectiles drawn."""
         for w in self.weapons:
             w.draw(surface, ox, oy)
+        return self.projectiles.draw(surface, ox, oy, view)
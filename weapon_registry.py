@@ -0,0 +1,129 @@
+"""
+Weapon registry: weapon names -> classes, imported on first use.
+
+Weapons are declared as "module:Class" strings and only imported when a
+weapon of that name is first handed out, so a launch pays for the weapons
+actually equipped (one per character) rather than every weapon module.
+Each first import is timed.
+
+Extra weapons can come from
+  * register() / register_definitions() at runtime,
+  * a JSON file of {"name": "module:Class"} named by VAMP_WEAPONS,
+  * installed packages exposing the "vamp.weapons" entry point group
+    (only scanned when a name is not found otherwise).
+
+    python weapon_registry.py        # import every weapon, report the cost
+"""
+import importlib
+import json
+import os
+import sys
+import time
+
+
+ENTRY_POINT_GROUP = "vamp.weapons"
+
+# Built-in weapons (the Weapon package)
+WEAPON_DEFINITIONS = {
+    "axe": "Weapon.axe:Axe",
+    "shuriken": "Weapon.shuriken:Shuriken",
+    "burst": "Weapon.burst:Burst",
+    "fireball": "Weapon.fireball:Fireball",
+    "gun": "Weapon.gun:Gun",
+}
+
+
+class WeaponRegistry:
+    """
+    Lazily resolved weapon classes.
+    resolve(name) imports and caches the class; import_times records how
+    long each first import took (modules already imported by then, e.g.
+    a shared weapon base, are not counted again).
+    """
+    def __init__(self, definitions=None):
+        self.definitions = {}       # name -> "module:Class" or class
+        self.classes = {}           # name -> resolved class
+        self.import_times = {}      # name -> seconds spent importing it
+        self._entry_points = None   # name -> EntryPoint, scanned on demand
+        if definitions:
+            self.register_definitions(definitions)
+
+    # ------------------------------------------------------------
+    # REGISTRATION
+    # ------------------------------------------------------------
+    def register(self, name, target):
+        """target: a weapon class, or "module:Class" to import on first use."""
+        self.definitions[name] = target
+        self.classes.pop(name, None)
+
+    def register_definitions(self, definitions):
+        for name, target in definitions.items():
+            self.register(name, target)
+
+    def load_file(self, path):
+        """Register the {"name": "module:Class"} definitions in a JSON file."""
+        with open(path) as f:
+            self.register_definitions(json.load(f))
+
+    def _entry_point(self, name):
+        if self._entry_points is None:
+            from importlib.metadata import entry_points
+            self._entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        return self._entry_points.get(name)
+
+    # ------------------------------------------------------------
+    # LOOKUP
+    # ------------------------------------------------------------
+    def __contains__(self, name):
+        return name in self.definitions or self._entry_point(name) is not None
+
+    def names(self):
+        """Every known weapon name, without importing any of them."""
+        self._entry_point("")
+        return sorted(set(self.definitions) | set(self._entry_points))
+
+    def resolve(self, name):
+        """The weapon class for `name` (imported on first call). KeyError if unknown."""
+        cls = self.classes.get(name)
+        if cls is not None:
+            return cls
+
+        target = self.definitions.get(name)
+        start = time.perf_counter()
+        if target is None:
+            entry_point = self._entry_point(name)
+            if entry_point is None:
+                raise KeyError(name)
+            cls = entry_point.load()
+        elif isinstance(target, str):
+            module_name, _, attr = target.partition(":")
+            cls = getattr(importlib.import_module(module_name), attr)
+        else:
+            cls = target
+        self.import_times[name] = time.perf_counter() - start
+
+        self.classes[name] = cls
+        return cls
+
+    def report(self):
+        """One line per imported weapon, slowest first."""
+        return "\n".join(f"{name:<12} {seconds * 1000:8.2f} ms"
+                         for name, seconds in sorted(self.import_times.items(),
+                                                     key=lambda item: -item[1]))
+
+
+registry = WeaponRegistry(WEAPON_DEFINITIONS)
+if os.environ.get("VAMP_WEAPONS"):
+    registry.load_file(os.environ["VAMP_WEAPONS"])
+
+
+if __name__ == "__main__":
+    failed = []
+    for weapon_name in registry.names():
+        try:
+            registry.resolve(weapon_name)
+        except Exception as exc:    # report broken weapons, keep going
+            failed.append(f"{weapon_name}: {exc!r}")
+    print(registry.report())
+    for line in failed:
+        print("FAILED", line, file=sys.stderr)
@@ -1,29 +1,120 @@
 import pygame
 import math
 
+from pool import release
+from sprite_atlas import circle_sprite
+
+MAGNET_RADIUS = 80  # orbs closer than this fly to the player
+MAX_ORBS = 1500     # default global cap on live orbs (see OrbMerger)
+ORB_COLOR = (50, 255, 100)
+ORB_RADIUS = 5
+
+
 class XPOrb(pygame.sprite.Sprite):
     def __init__(self, x, y, amount=1):
         super(XPOrb, self).__init__()
-        self.image = pygame.Surface((1, 1), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = circle_sprite(ORB_COLOR, ORB_RADIUS)
+        self.rect = pygame.Rect(x, y, 1, 1)   # 1x1: position only
         self.amount = amount  # 这颗球能提供多少 XP
 
-    def update(self, player):
+    def reset(self, x, y, amount=1):
+        """Re-arm a pooled orb (see pool.py)."""
+        self.rect.update(x, y, 1, 1)
+        self.amount = amount
+
+    def update(self, player, index=None):
+        """Fly to the player inside MAGNET_RADIUS. `index` is kept in sync if given."""
         if not player.is_alive():
             return
         dx = player.rect.centerx - self.rect.centerx
         dy = player.rect.centery - self.rect.centery
         dist = math.hypot(dx, dy)
-        if dist < 80:
+        if dist < MAGNET_RADIUS:
             speed = 8
             if dist > 0:
                 self.rect.x += (dx / dist) * speed
                 self.rect.y += (dy / dist) * speed
+                if index is not None:
+                    index.move(self, *self.rect.center)
             if dist < 20:
                 player.gain_xp(self.amount)
                 self.kill()
+                release(self)
 
     def draw(self, surface, offset_x, offset_y):
-        cx = int(self.rect.centerx - offset_x)
-        cy = int(self.rect.centery - offset_y)
-        pygame.draw.circle(surface, (50, 255, 100), (cx, cy), 5)
+        surface.blit(self.image, (int(self.rect.centerx - offset_x) - ORB_RADIUS,
+                                  int(self.rect.centery - offset_y) - ORB_RADIUS))
+
+
+def draw_orbs(surface, orbs, ox, oy):
+    """Draw all orbs with one Surface.blits call."""
+    r = ORB_RADIUS
+    surface.blits([(o.image, (int(o.rect.centerx - ox) - r, int(o.rect.centery - oy) - r))
+                   for o in orbs], doreturn=False)
+
+
+# ---------------------------------------------------------
+# ORB COALESCING
+# ---------------------------------------------------------
+class OrbMerger:
+    """
+    Merges orbs that sit close together into one orb carrying the summed
+    amount, so the orb group stays bounded on long runs. Total XP on the
+    ground never changes.
+
+    Works incrementally: each update() handles at most `batch` orbs from
+    a queue that is refilled once per pass over the group. While the
+    group is above `max_orbs` every queued orb is folded into its nearest
+    neighbour regardless of distance (and more orbs are handled per tick)
+    until the cap holds again. Orbs near the player are left alone so the
+    ones flying to it are never moved. Needs a SpatialGroup.
+    """
+    def __init__(self, merge_radius=32, max_orbs=MAX_ORBS, batch=128):
+        self.merge_radius = merge_radius
+        self.max_orbs = max_orbs
+        self.batch = batch
+        self.merges = 0
+        self._queue = []
+
+    def update(self, xp_orbs, player):
+        if not self._queue:
+            if len(xp_orbs) < 2:
+                return
+            self._queue = xp_orbs.sprites()
+
+        over = len(xp_orbs) - self.max_orbs
+        budget = self.batch * 4 if over > 0 else self.batch
+
+        px, py = player.rect.center
+        keep_out = (MAGNET_RADIUS * 2) ** 2
+
+        def mergeable(o):
+            ox, oy = o.rect.center
+            return (ox - px) ** 2 + (oy - py) ** 2 >= keep_out
+
+        queue = self._queue
+        while queue and budget > 0:
+            orb = queue.pop()
+            budget -= 1
+            if not orb.alive() or not mergeable(orb):
+                continue
+            x, y = orb.rect.center
+
+            if over > 0:
+                # Over the cap: fold this orb into its nearest neighbour
+                for other in xp_orbs.nearest(x, y, 3):
+                    if other is not orb and mergeable(other):
+                        other.amount += orb.amount
+                        orb.kill()
+                        release(orb)
+                        self.merges += 1
+                        over -= 1
+                        break
+            else:
+                # Absorb everything within merge_radius
+                for other in xp_orbs.query_radius(x, y, self.merge_radius):
+                    if other is not orb and mergeable(other):
+                        orb.amount += other.amount
+                        other.kill()
+                        release(other)
+                        self.merges += 1